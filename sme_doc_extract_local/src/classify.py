@@ -3,9 +3,26 @@ classify.py – Heuristic document-type classifier.
 
 Uses keyword counting on the extracted plain text.  If the CLI caller
 explicitly passes --doc-type, this module is bypassed entirely.
+
+All keywords are compiled into a single Aho-Corasick automaton on the first
+classification, so a document is scanned once regardless of how many
+keywords are configured.  If ``SME_DOC_EXTRACT_CACHE_DIR`` is set, the
+compiled automaton is pickled there (keyed by a hash of the keyword table)
+so later CLI runs load it instead of rebuilding it; by default nothing is
+written to disk.
 """
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import ahocorasick
+
 from src.constants import (
     CLASSIFIER_MIN_HITS,
     CLASSIFIER_PATTERNS,
@@ -19,9 +36,96 @@ from src.constants import (
 )
 
 
-def _count_hits(text_lower: str, keywords: list[str]) -> int:
-    """Count how many keywords appear in ``text_lower``."""
-    return sum(1 for kw in keywords if kw in text_lower)
+def _build_automaton() -> ahocorasick.Automaton:
+    """
+    Build an Aho-Corasick automaton over every keyword in ``CLASSIFIER_PATTERNS``.
+
+    Each keyword maps to ``(keyword, doc_types)`` so a keyword shared by
+    several document types is matched once and credited to all of them.
+    """
+    doc_types_by_keyword: dict[str, list[str]] = {}
+    for doc_type, pattern in CLASSIFIER_PATTERNS.items():
+        for kw in pattern["keywords"]:
+            doc_types_by_keyword.setdefault(kw, []).append(doc_type)
+
+    automaton = ahocorasick.Automaton()
+    for kw, doc_types in doc_types_by_keyword.items():
+        automaton.add_word(kw, (kw, tuple(doc_types)))
+    automaton.make_automaton()
+    return automaton
+
+
+# Opt-in on-disk cache for the compiled automaton; unset means build in memory.
+_CACHE_DIR_ENV = "SME_DOC_EXTRACT_CACHE_DIR"
+
+
+def _keyword_table_key() -> str:
+    """Return a sha256 hex digest identifying the current keyword table."""
+    pairs = sorted(
+        (kw, doc_type)
+        for doc_type, pattern in CLASSIFIER_PATTERNS.items()
+        for kw in pattern["keywords"]
+    )
+    return hashlib.sha256(json.dumps(pairs).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _get_automaton() -> ahocorasick.Automaton:
+    """
+    Return the compiled automaton, building it on first use.
+
+    When ``SME_DOC_EXTRACT_CACHE_DIR`` names a directory, the automaton is
+    loaded from a pickle there, or built and written to it on a miss.  The
+    cache file is written to a temporary file and atomically renamed into
+    place, so concurrent processes never read a partial file.  A missing,
+    stale or corrupt cache file, or any cache I/O error, falls back to
+    building the automaton in memory.
+    """
+    cache_dir_setting = os.environ.get(_CACHE_DIR_ENV)
+    if not cache_dir_setting:
+        return _build_automaton()
+
+    cache_dir = Path(cache_dir_setting).expanduser()
+    cache_path = cache_dir / f"classifier-{_keyword_table_key()}.pkl"
+    try:
+        with cache_path.open("rb") as fh:
+            automaton = pickle.load(fh)
+        if isinstance(automaton, ahocorasick.Automaton):
+            return automaton
+    except Exception:  # noqa: BLE001
+        pass
+
+    automaton = _build_automaton()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump(automaton, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, cache_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError:
+        pass
+    return automaton
+
+
+def _score(text_lower: str) -> dict[str, int]:
+    """
+    Count, per document type, how many of its keywords appear in ``text_lower``.
+
+    A keyword counts once no matter how often it occurs.
+    """
+    scores: dict[str, int] = {doc_type: 0 for doc_type in CLASSIFIER_PATTERNS}
+    seen: set[str] = set()
+    for _end_index, (kw, doc_types) in _get_automaton().iter(text_lower):
+        if kw in seen:
+            continue
+        seen.add(kw)
+        for doc_type in doc_types:
+            scores[doc_type] += 1
+    return scores
 
 
 def classify_doc(text: str) -> str:
@@ -46,11 +150,7 @@ def classify_doc(text: str) -> str:
     if not text or not text.strip():
         return DOC_TYPE_UNKNOWN
 
-    text_lower = text.lower()
-
-    scores: dict[str, int] = {}
-    for doc_type, pattern in CLASSIFIER_PATTERNS.items():
-        scores[doc_type] = _count_hits(text_lower, pattern["keywords"])
+    scores = _score(text.lower())
 
     if not scores:
         return DOC_TYPE_UNKNOWN
@@ -73,10 +173,7 @@ def classify_doc_with_scores(text: str) -> tuple[str, dict[str, int]]:
     if not text or not text.strip():
         return DOC_TYPE_UNKNOWN, {}
 
-    text_lower = text.lower()
-    scores: dict[str, int] = {}
-    for doc_type, pattern in CLASSIFIER_PATTERNS.items():
-        scores[doc_type] = _count_hits(text_lower, pattern["keywords"])
+    scores = _score(text.lower())
 
     if not scores:
         return DOC_TYPE_UNKNOWN, {}
@@ -2,14 +2,17 @@
 constants.py – Shared labels, keyword sets, and thresholds.
 """
 
+import sys
+
 # ── Document type labels ──────────────────────────────────────
-DOC_TYPE_INVOICE = "invoice"
-DOC_TYPE_RECEIPT = "receipt"
-DOC_TYPE_DELIVERY_RECEIPT = "delivery_receipt"
-DOC_TYPE_UTILITY_BILL = "utility_bill"
-DOC_TYPE_UTILITY = "utility"
-DOC_TYPE_LOGISTICS = "logistics"
-DOC_TYPE_UNKNOWN = "unknown"
+# Interned so labels read back from config or JSON share one object.
+DOC_TYPE_INVOICE = sys.intern("invoice")
+DOC_TYPE_RECEIPT = sys.intern("receipt")
+DOC_TYPE_DELIVERY_RECEIPT = sys.intern("delivery_receipt")
+DOC_TYPE_UTILITY_BILL = sys.intern("utility_bill")
+DOC_TYPE_UTILITY = sys.intern("utility")
+DOC_TYPE_LOGISTICS = sys.intern("logistics")
+DOC_TYPE_UNKNOWN = sys.intern("unknown")
 
 ALLOWED_DOC_TYPES = [
     DOC_TYPE_INVOICE,
@@ -79,6 +82,10 @@ DEFAULT_GEMINI_MODEL = "gemini-2.5-flash"
 GEMINI_MAX_RETRIES = 3
 GEMINI_TEMPERATURE = 0.0
 
+# Skip Gemini for invoices/receipts when the Invoice or Receipt Parser's
+# entities have at least this mean confidence.
+DOCAI_ENTITY_CONFIDENCE_THRESHOLD = 0.9
+
 # ── Validation tolerances ─────────────────────────────────────
 # Allowed absolute difference: subtotal + tax vs total
 INVOICE_TOTAL_TOLERANCE = 1.0
@@ -89,10 +96,10 @@ CONFIDENCE_PRESENT_INVALID = 0.4
 CONFIDENCE_MISSING = 0.0
 
 # ── Allowed logistics modes ───────────────────────────────────
-LOGISTICS_ALLOWED_MODES = {"truck", "air", "sea", "rail"}
+LOGISTICS_ALLOWED_MODES = frozenset({"truck", "air", "sea", "rail"})
 
 # ── Allowed utility bill types ────────────────────────────────
-UTILITY_ALLOWED_TYPES = {"gas", "water", "electricity", "other"}
+UTILITY_ALLOWED_TYPES = frozenset({"gas", "water", "electricity", "other"})
 
 # ── Output file names ─────────────────────────────────────────
 OUT_RAW_TEXT = "raw_text.txt"
@@ -116,3 +123,17 @@ IMAGE_MIME_TYPES = {
 
 # Combined allowed extensions
 ALLOWED_EXTENSIONS = {".pdf", *IMAGE_MIME_TYPES.keys()}
+
+# ── File signatures ("magic bytes") per MIME type ─────────────
+# Checked against the start of each input before calling Document AI.
+FILE_SIGNATURES = {
+    PDF_MIME_TYPE: (b"%PDF-",),
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",),
+    "image/gif": (b"GIF87a", b"GIF89a"),
+    "image/bmp": (b"BM",),
+    "image/webp": (b"RIFF",),
+    "image/tiff": (b"II*\x00", b"MM\x00*"),
+}
+# PDF readers accept a header anywhere in the first 1 KiB.
+PDF_HEADER_SEARCH_BYTES = 1024
@@ -4,7 +4,8 @@ docai_client.py – Thin wrapper around the Google Cloud Document AI API.
 Responsibilities
 ----------------
 * Build a DocumentProcessorServiceClient from config.
-* Send a PDF (as raw bytes) to a configured processor.
+* Send a PDF (as raw bytes, from a path or an in-memory buffer) to a
+  configured processor.
 * Return the raw ``google.cloud.documentai.Document`` protobuf object.
 
 The caller is responsible for extracting text / entities from the response
@@ -16,11 +17,26 @@ from pathlib import Path
 
 from google.api_core.exceptions import GoogleAPICallError
 from google.cloud import documentai
+from google.cloud.documentai_v1.services.document_processor_service.transports.grpc import (
+    DocumentProcessorServiceGrpcTransport,
+)
 
 from src.config import Config
 from src.constants import PDF_MIME_TYPE, IMAGE_MIME_TYPES
 
 
+# gRPC channel options for the Document AI client.  The message-size limits
+# are the GAPIC transport defaults (which a custom channel must restate);
+# keepalive pings keep the HTTP/2 connection warm between requests so a
+# batch run does not pay a fresh TCP/TLS handshake after idle gaps.
+_GRPC_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 30_000),
+    ("grpc.keepalive_timeout_ms", 10_000),
+]
+
+
 def build_client(config: Config) -> documentai.DocumentProcessorServiceClient:
     """
     Create and return a Document AI client.
@@ -29,6 +45,10 @@ def build_client(config: Config) -> documentai.DocumentProcessorServiceClient:
     configured via the GOOGLE_APPLICATION_CREDENTIALS env var that
     ``config.py`` sets at startup.
 
+    It talks gRPC directly to the regional endpoint for
+    ``config.docai_location`` over a single keepalive channel.  gRPC
+    channels are thread-safe, so build one client per run and share it.
+
     Parameters
     ----------
     config:
@@ -38,8 +58,13 @@ def build_client(config: Config) -> documentai.DocumentProcessorServiceClient:
     -------
     DocumentProcessorServiceClient
     """
-    client_options = {"api_endpoint": f"{config.docai_location}-documentai.googleapis.com"}
-    return documentai.DocumentProcessorServiceClient(client_options=client_options)
+    api_endpoint = f"{config.docai_location}-documentai.googleapis.com"
+    channel = DocumentProcessorServiceGrpcTransport.create_channel(
+        f"{api_endpoint}:443",
+        options=_GRPC_CHANNEL_OPTIONS,
+    )
+    transport = DocumentProcessorServiceGrpcTransport(host=api_endpoint, channel=channel)
+    return documentai.DocumentProcessorServiceClient(transport=transport)
 
 
 def get_mime_type(file_path: Path) -> str:
@@ -85,6 +110,10 @@ def process_pdf(
     """
     Send a local PDF or image file to Document AI and return the parsed Document.
 
+    Reads the file and delegates to ``process_pdf_bytes``.  Callers that send
+    the same file more than once should read it themselves and call
+    ``process_pdf_bytes`` directly.
+
     Parameters
     ----------
     pdf_path:
@@ -115,14 +144,64 @@ def process_pdf(
     if not pdf_path.exists():
         raise FileNotFoundError(f"File not found: {pdf_path}")
 
-    if client is None:
-        client = build_client(config)
-
     # Detect MIME type from extension
     mime_type = get_mime_type(pdf_path)
 
+    return process_pdf_bytes(
+        pdf_bytes=pdf_path.read_bytes(),
+        mime_type=mime_type,
+        config=config,
+        client=client,
+        processor_name=processor_name,
+        max_pages=max_pages,
+        display_name=pdf_path.name,
+    )
+
+
+def process_pdf_bytes(
+    pdf_bytes: bytes,
+    mime_type: str,
+    config: Config,
+    client: documentai.DocumentProcessorServiceClient | None = None,
+    processor_name: str | None = None,
+    max_pages: int | None = None,
+    display_name: str = "document",
+) -> documentai.Document:
+    """
+    Send in-memory PDF or image bytes to Document AI and return the parsed Document.
+
+    Parameters
+    ----------
+    pdf_bytes:
+        Raw file content.
+    mime_type:
+        MIME type of *pdf_bytes* (see ``get_mime_type``).
+    config:
+        Validated application configuration.
+    client:
+        Optional pre-built client (avoids re-connecting on batch runs).
+    processor_name:
+        Full Document AI processor resource name. If not provided, the
+        config's form processor is used.
+    max_pages:
+        If set, only process the first N pages (PDFs only; ignored for images).
+    display_name:
+        Name used in error messages (typically the source file name).
+
+    Returns
+    -------
+    google.cloud.documentai.Document
+
+    Raises
+    ------
+    GoogleAPICallError
+        On any Document AI API failure.
+    """
+    if client is None:
+        client = build_client(config)
+
     raw_document = documentai.RawDocument(
-        content=pdf_path.read_bytes(),
+        content=pdf_bytes,
         mime_type=mime_type,
     )
 
@@ -158,6 +237,6 @@ def process_pdf(
         )
     except GoogleAPICallError as exc:
         raise GoogleAPICallError(
-            f"Document AI call failed for '{pdf_path.name}': {exc}"
+            f"Document AI call failed for '{display_name}': {exc}"
         ) from exc
     return response.document
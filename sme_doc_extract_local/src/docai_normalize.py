@@ -23,23 +23,38 @@ class NormalizedDocAIResult:
     page_count: int = 0
 
 
-def _get_text_anchor(document: documentai.Document, text_anchor: documentai.Document.TextAnchor) -> str:
-    """
-    Reconstruct a substring of ``document.text`` from a TextAnchor.
+@dataclass
+class NormBundle:
+    """Text views of a Document AI ``Document``, built in a single traversal."""
 
-    Document AI stores all text in ``document.text`` and references
-    segments via ``TextAnchor.text_segments``.
-    """
+    full_text: str = ""
+    enriched_text: str = ""
+    page_count: int = 0
+    table_count: int = 0
+
+
+def _anchor_text(text: str, text_anchor: documentai.Document.TextAnchor) -> str:
+    """Join the segments of *text* referenced by a TextAnchor."""
     if not text_anchor or not text_anchor.text_segments:
         return ""
     parts: list[str] = []
     for segment in text_anchor.text_segments:
         start = int(segment.start_index)
         end = int(segment.end_index)
-        parts.append(document.text[start:end])
+        parts.append(text[start:end])
     return "".join(parts)
 
 
+def _get_text_anchor(document: documentai.Document, text_anchor: documentai.Document.TextAnchor) -> str:
+    """
+    Reconstruct a substring of ``document.text`` from a TextAnchor.
+
+    Document AI stores all text in ``document.text`` and references
+    segments via ``TextAnchor.text_segments``.
+    """
+    return _anchor_text(document.text, text_anchor)
+
+
 def extract_entities(document: documentai.Document) -> list[dict]:
     """
     Return a flat list of entities as plain dicts.
@@ -59,14 +74,25 @@ def extract_entities(document: documentai.Document) -> list[dict]:
     return result
 
 
-def _table_to_text(document: documentai.Document, table: documentai.Document.Page.Table) -> str:
-    """Convert a single Document AI table into a tab-separated plain-text block."""
+def _table_to_text(
+    document: documentai.Document,
+    table: documentai.Document.Page.Table,
+    text: str | None = None,
+) -> str:
+    """
+    Convert a single Document AI table into a tab-separated plain-text block.
+
+    *text* is ``document.text`` if the caller already has it, which saves
+    re-reading it from the proto for every cell.
+    """
+    if text is None:
+        text = document.text
     rows_text: list[str] = []
 
     def _extract_row(row: documentai.Document.Page.Table.TableRow) -> str:
         cells: list[str] = []
         for cell in row.cells:
-            cell_text = _get_text_anchor(document, cell.layout.text_anchor).replace("\n", " ").strip()
+            cell_text = _anchor_text(text, cell.layout.text_anchor).replace("\n", " ").strip()
             cells.append(cell_text)
         return "\t".join(cells)
 
@@ -130,9 +156,39 @@ def build_enriched_text(result: NormalizedDocAIResult) -> str:
     Tables are appended at the end under a ``[TABLES]`` header so Gemini
     can use them for line-item extraction.
     """
-    parts: list[str] = [result.full_text.strip()]
-    if result.table_snippets:
+    return _compose_enriched_text(result.full_text, result.table_snippets)
+
+
+def _compose_enriched_text(full_text: str, table_snippets: list[str]) -> str:
+    """Append table snippets to *full_text* under a ``[TABLES]`` header."""
+    parts: list[str] = [full_text.strip()]
+    if table_snippets:
         parts.append("\n\n[TABLES]\n")
-        for i, snippet in enumerate(result.table_snippets, start=1):
+        for i, snippet in enumerate(table_snippets, start=1):
             parts.append(f"--- Table {i} ---\n{snippet}")
     return "\n".join(parts)
+
+
+def normalize_and_enrich(document: documentai.Document) -> NormBundle:
+    """
+    Build the text, enriched text and page count in one walk over the pages.
+
+    Equivalent to ``build_enriched_text(normalize(document))`` for the fields
+    the pipeline needs, but reads ``document.text`` once, visits each page
+    once and skips entity extraction.
+    """
+    full_text = document.text or ""
+    page_count = 0
+    tables: list[str] = []
+    for page in document.pages:
+        page_count += 1
+        for table in page.tables:
+            snippet = _table_to_text(document, table, full_text)
+            if snippet.strip():
+                tables.append(snippet)
+    return NormBundle(
+        full_text=full_text,
+        enriched_text=_compose_enriched_text(full_text, tables),
+        page_count=page_count,
+        table_count=len(tables),
+    )
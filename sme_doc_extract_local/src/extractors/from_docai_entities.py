@@ -0,0 +1,104 @@
+"""
+from_docai_entities.py – Build an invoice extraction from Document AI entities.
+
+The Invoice and Receipt Parsers already return structured entities with a
+confidence score each.  When those are confident enough the Gemini call is
+redundant, so the pipeline maps the entities straight onto the invoice
+fields and only runs the validators.
+
+The returned dict has the same keys as the Gemini invoice extractor, so
+``validators.validate_invoice`` handles both sources the same way.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+# Document AI entity type → invoice extraction field.
+# Covers the Invoice Parser and the Receipt (expense) Parser.
+_INVOICE_ENTITY_FIELDS: dict[str, str] = {
+    "supplier_name": "vendor_name",
+    "invoice_id": "invoice_number",
+    "receipt_id": "invoice_number",
+    "invoice_date": "invoice_date",
+    "receipt_date": "invoice_date",
+    "due_date": "due_date",
+    "currency": "currency",
+    "net_amount": "subtotal",
+    "total_tax_amount": "tax",
+    "total_amount": "total",
+}
+
+# Properties of a ``line_item`` entity → line item field.
+_LINE_ITEM_FIELDS: dict[str, str] = {
+    "line_item/description": "description",
+    "line_item/quantity": "quantity",
+    "line_item/unit_price": "unit_price",
+    "line_item/amount": "total_price",
+}
+
+# The entity path replaces Gemini entirely, so it is only taken when the
+# parser found the total and at least one of these identifying fields.
+_IDENTIFYING_FIELDS = ("vendor_name", "invoice_number")
+
+_INVOICE_FIELDS = (
+    "vendor_name",
+    "invoice_number",
+    "invoice_date",
+    "due_date",
+    "currency",
+    "subtotal",
+    "tax",
+    "total",
+)
+
+
+def _entity_value(entity: Any) -> str | None:
+    """Prefer Document AI's normalised value (ISO dates, plain amounts) over the raw mention."""
+    normalized = entity.normalized_value.text if entity.normalized_value else ""
+    value = (normalized or entity.mention_text or "").strip()
+    return value or None
+
+
+def mean_entity_confidence(document: Any) -> float | None:
+    """Return the mean confidence of the document's top-level entities, or None if it has none."""
+    entities = document.entities
+    if not entities:
+        return None
+    return sum(entity.confidence for entity in entities) / len(entities)
+
+
+def extract_invoice_from_entities(document: Any) -> dict[str, Any] | None:
+    """
+    Map Invoice / Receipt Parser entities onto the invoice extraction fields.
+
+    The first entity of each type wins.  Fields without an entity are None.
+
+    Returns
+    -------
+    dict matching the Gemini invoice extractor's output, or None if the
+    entities lack the total or both the vendor name and invoice number
+    (callers should fall back to Gemini).
+    """
+    result: dict[str, Any] = dict.fromkeys(_INVOICE_FIELDS)
+    line_items: list[dict[str, Any]] = []
+
+    for entity in document.entities:
+        if entity.type_ == "line_item":
+            item: dict[str, Any] = dict.fromkeys(_LINE_ITEM_FIELDS.values())
+            for prop in entity.properties:
+                key = _LINE_ITEM_FIELDS.get(prop.type_)
+                if key is not None and item[key] is None:
+                    item[key] = _entity_value(prop)
+            if item["description"] is None:
+                item["description"] = _entity_value(entity)
+            line_items.append(item)
+            continue
+
+        key = _INVOICE_ENTITY_FIELDS.get(entity.type_)
+        if key is not None and result[key] is None:
+            result[key] = _entity_value(entity)
+
+    if result["total"] is None or all(result[f] is None for f in _IDENTIFYING_FIELDS):
+        return None
+    result["line_items"] = line_items
+    return result
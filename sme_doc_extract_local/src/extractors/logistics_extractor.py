@@ -12,15 +12,15 @@ from __future__ import annotations
 from typing import Any
 
 from src.config import Config
-from src.gemini_client import call_gemini
+from src.gemini_client import (
+    call_gemini,
+    call_gemini_batch,
+    format_batch_documents,
+    prerender_prompt,
+)
 
 # ── Prompt template ───────────────────────────────────────────────────────────
-_LOGISTICS_PROMPT_TEMPLATE = """\
-You are a precise document data-extraction assistant.
-
-Your task: extract structured logistics / shipping information from the document
-text below and return it as a single JSON object — nothing else, no explanation.
-
+_LOGISTICS_INSTRUCTIONS = """\
 RULES:
 1. Return ONLY valid JSON. No markdown fences, no prose, no comments.
 2. Use null (JSON null) for any field that is absent or unreadable.
@@ -31,25 +31,36 @@ RULES:
 7. Do NOT invent or guess values.
 
 REQUIRED JSON STRUCTURE:
-{{
+{
   "shipment_id": string | null,
   "date": "YYYY-MM-DD" | null,
   "carrier": string | null,
   "mode": "truck" | "air" | "sea" | "rail" | null,
-  "origin": {{
+  "origin": {
     "city": string | null,
     "state": string | null,
     "country": string | null
-  }} | null,
-  "destination": {{
+  } | null,
+  "destination": {
     "city": string | null,
     "state": string | null,
     "country": string | null
-  }} | null,
+  } | null,
   "distance_km": number | null,
   "weight_kg": number | null,
   "packages_count": integer | null
-}}
+}
+"""
+
+# Sent once per cached model as its system instruction (see
+# gemini_client._get_model), so prompts only carry the task and the text.
+_LOGISTICS_SYSTEM_INSTRUCTION = (
+    "You are a precise document data-extraction assistant.\n\n" + _LOGISTICS_INSTRUCTIONS
+)
+
+_LOGISTICS_PROMPT_TEMPLATE = """\
+Your task: extract structured logistics / shipping information from the document
+text below and return it as a single JSON object — nothing else, no explanation.
 
 DOCUMENT TEXT:
 ---
@@ -59,6 +70,25 @@ DOCUMENT TEXT:
 Return ONLY the JSON object now.
 """
 
+# Static prompt text rendered once; each call only concatenates the document.
+_LOGISTICS_PROMPT_PREFIX, _LOGISTICS_PROMPT_SUFFIX = prerender_prompt(_LOGISTICS_PROMPT_TEMPLATE)
+
+_LOGISTICS_BATCH_PROMPT_TEMPLATE = """\
+Your task: the text below contains {document_count} separate logistics /
+shipping documents, each introduced by a "===DOC n===" marker. Extract
+structured logistics / shipping information from EACH document independently
+and return a JSON array of exactly {document_count} objects, one per document,
+in document order — nothing else, no explanation. Every array element MUST
+follow the required JSON structure.
+
+DOCUMENTS:
+---
+{document_text}
+---
+
+Return ONLY the JSON array now.
+"""
+
 
 def extract_logistics(
     document_text: str,
@@ -85,6 +115,51 @@ def extract_logistics(
         warnings = []
 
     truncated_text = document_text[:12_000]
-    prompt = _LOGISTICS_PROMPT_TEMPLATE.format(document_text=truncated_text)
+    prompt = _LOGISTICS_PROMPT_PREFIX + truncated_text + _LOGISTICS_PROMPT_SUFFIX
+
+    return call_gemini(
+        prompt=prompt,
+        config=config,
+        warnings=warnings,
+        system_instruction=_LOGISTICS_SYSTEM_INSTRUCTION,
+    )
+
+
+def extract_logistics_batch(
+    document_texts: list[str],
+    config: Config,
+    warnings: list[str] | None = None,
+) -> list[dict[str, Any]] | None:
+    """
+    Extract logistics fields from several documents with one Gemini request.
+
+    Parameters
+    ----------
+    document_texts:
+        Plain texts (+ optional table snippets) from Document AI, one per document.
+    config:
+        Validated application config.
+    warnings:
+        Mutable list – warnings are appended in-place.
+
+    Returns
+    -------
+    list of dicts matching LogisticsSchema, in input order, or None if the batched
+    response could not be parsed (fall back to ``extract_logistics``).
+    """
+    if warnings is None:
+        warnings = []
+
+    truncated_texts = [text[:12_000] for text in document_texts]
+    prompt = _LOGISTICS_BATCH_PROMPT_TEMPLATE.format(
+        document_count=len(truncated_texts),
+        document_text=format_batch_documents(truncated_texts),
+    )
 
-    return call_gemini(prompt=prompt, config=config, warnings=warnings)
+    return call_gemini_batch(
+        prompt=prompt,
+        config=config,
+        expected_count=len(truncated_texts),
+        warnings=warnings,
+        system_instruction=_LOGISTICS_SYSTEM_INSTRUCTION,
+    )
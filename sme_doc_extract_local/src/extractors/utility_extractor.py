@@ -12,15 +12,15 @@ from __future__ import annotations
 from typing import Any
 
 from src.config import Config
-from src.gemini_client import call_gemini
+from src.gemini_client import (
+    call_gemini,
+    call_gemini_batch,
+    format_batch_documents,
+    prerender_prompt,
+)
 
 # ── Prompt template ───────────────────────────────────────────────────────────
-_UTILITY_PROMPT_TEMPLATE = """\
-You are a precise document data-extraction assistant.
-
-Your task: extract structured utility bill information from the document text
-below and return it as a single JSON object — nothing else, no explanation.
-
+_UTILITY_INSTRUCTIONS = """\
 RULES:
 1. Return ONLY valid JSON. No markdown fences, no prose, no comments.
 2. Use null (JSON null) for any field that is absent or unreadable.
@@ -30,7 +30,7 @@ RULES:
 6. Do NOT invent or guess values.
 
 REQUIRED JSON STRUCTURE:
-{{
+{
   "provider": string | null,
   "account_id": string | null,
   "location": string | null,
@@ -43,11 +43,22 @@ REQUIRED JSON STRUCTURE:
   "water_unit": string | null,
   "total_amount": number | null,
   "currency": "USD" | null
-}}
+}
 
 - location: service or billing address as "City, State" (e.g. "Austin, TX"). Omit state if not present.
 - utility_type: one of "gas", "water", "electricity", or "other" based on what the bill is for.
 - For water bills: water_volume = usage amount (plain number); water_unit = unit from the document (e.g. gal, m³, ccf) or null.
+"""
+
+# Sent once per cached model as its system instruction (see
+# gemini_client._get_model), so prompts only carry the task and the text.
+_UTILITY_SYSTEM_INSTRUCTION = (
+    "You are a precise document data-extraction assistant.\n\n" + _UTILITY_INSTRUCTIONS
+)
+
+_UTILITY_PROMPT_TEMPLATE = """\
+Your task: extract structured utility bill information from the document text
+below and return it as a single JSON object — nothing else, no explanation.
 
 DOCUMENT TEXT:
 ---
@@ -57,6 +68,25 @@ DOCUMENT TEXT:
 Return ONLY the JSON object now.
 """
 
+# Static prompt text rendered once; each call only concatenates the document.
+_UTILITY_PROMPT_PREFIX, _UTILITY_PROMPT_SUFFIX = prerender_prompt(_UTILITY_PROMPT_TEMPLATE)
+
+_UTILITY_BATCH_PROMPT_TEMPLATE = """\
+Your task: the text below contains {document_count} separate utility bills,
+each introduced by a "===DOC n===" marker. Extract structured utility bill
+information from EACH document independently and return a JSON array of
+exactly {document_count} objects, one per document, in document order —
+nothing else, no explanation. Every array element MUST follow the required
+JSON structure.
+
+DOCUMENTS:
+---
+{document_text}
+---
+
+Return ONLY the JSON array now.
+"""
+
 
 def extract_utility(
     document_text: str,
@@ -83,6 +113,51 @@ def extract_utility(
         warnings = []
 
     truncated_text = document_text[:12_000]
-    prompt = _UTILITY_PROMPT_TEMPLATE.format(document_text=truncated_text)
+    prompt = _UTILITY_PROMPT_PREFIX + truncated_text + _UTILITY_PROMPT_SUFFIX
+
+    return call_gemini(
+        prompt=prompt,
+        config=config,
+        warnings=warnings,
+        system_instruction=_UTILITY_SYSTEM_INSTRUCTION,
+    )
+
+
+def extract_utility_batch(
+    document_texts: list[str],
+    config: Config,
+    warnings: list[str] | None = None,
+) -> list[dict[str, Any]] | None:
+    """
+    Extract utility-bill fields from several documents with one Gemini request.
+
+    Parameters
+    ----------
+    document_texts:
+        Plain texts (+ optional table snippets) from Document AI, one per document.
+    config:
+        Validated application config.
+    warnings:
+        Mutable list – warnings are appended in-place.
+
+    Returns
+    -------
+    list of dicts matching UtilitySchema, in input order, or None if the batched
+    response could not be parsed (fall back to ``extract_utility``).
+    """
+    if warnings is None:
+        warnings = []
 
-    return call_gemini(prompt=prompt, config=config, warnings=warnings)
+    truncated_texts = [text[:12_000] for text in document_texts]
+    prompt = _UTILITY_BATCH_PROMPT_TEMPLATE.format(
+        document_count=len(truncated_texts),
+        document_text=format_batch_documents(truncated_texts),
+    )
+
+    return call_gemini_batch(
+        prompt=prompt,
+        config=config,
+        expected_count=len(truncated_texts),
+        warnings=warnings,
+        system_instruction=_UTILITY_SYSTEM_INSTRUCTION,
+    )
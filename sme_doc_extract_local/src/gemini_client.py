@@ -5,6 +5,7 @@ Responsibilities
 ----------------
 * Configure the SDK with the API key from Config.
 * Accept a text prompt and return cleaned JSON as a Python dict.
+* Accept a multi-document prompt and return one dict per document.
 * Strip markdown code fences (```json ... ```) that Gemini sometimes emits.
 * Retry up to GEMINI_MAX_RETRIES times if JSON parsing fails.
 * On total failure return a structured error dict and populate warnings.
@@ -14,9 +15,10 @@ from __future__ import annotations
 import json
 import re
 import time
-from typing import Any
+from typing import Any, Callable
 
 import google.generativeai as genai
+import orjson
 
 from src.config import Config
 from src.constants import GEMINI_MAX_RETRIES, GEMINI_TEMPERATURE
@@ -48,6 +50,20 @@ def _strip_code_fences(raw: str) -> str:
     return raw.strip()
 
 
+def _loads(text: str) -> Any:
+    """
+    Parse JSON with orjson, falling back to the stdlib parser.
+
+    orjson rejects the ``NaN`` / ``Infinity`` literals that ``json.loads``
+    accepts, which a model reply may contain for unknown numbers.
+    Raises ``ValueError`` if neither parser accepts *text*.
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
 def _try_parse_json(text: str) -> dict[str, Any] | None:
     """
     Attempt to parse *text* as JSON.
@@ -55,19 +71,130 @@ def _try_parse_json(text: str) -> dict[str, Any] | None:
     Returns the parsed dict or None on failure.
     """
     try:
-        data = json.loads(_strip_code_fences(text))
+        data = _loads(_strip_code_fences(text))
         if isinstance(data, dict):
             return data
-    except (json.JSONDecodeError, ValueError):
+    except ValueError:
         pass
     return None
 
 
+def _try_parse_json_array(text: str, expected_count: int) -> list[dict[str, Any]] | None:
+    """
+    Attempt to parse *text* as a JSON array of exactly *expected_count* objects.
+
+    Returns the parsed list or None on failure.
+    """
+    try:
+        data = _loads(_strip_code_fences(text))
+    except ValueError:
+        return None
+    if (
+        isinstance(data, list)
+        and len(data) == expected_count
+        and all(isinstance(item, dict) for item in data)
+    ):
+        return data
+    return None
+
+
+def prerender_prompt(template: str, placeholder: str = "document_text") -> tuple[str, str]:
+    """
+    Split a ``str.format`` prompt template around its single *placeholder*.
+
+    Returns the fully rendered ``(prefix, suffix)`` – ``{{``/``}}`` escapes
+    already resolved – so the per-document prompt is just
+    ``prefix + text + suffix`` instead of a ``format()`` over the whole
+    template on every call.
+    """
+    prefix, suffix = template.split("{" + placeholder + "}")
+    return prefix.format(), suffix.format()
+
+
+def format_batch_documents(document_texts: list[str]) -> str:
+    """
+    Join several document texts into one block for a batched prompt.
+
+    Each document is introduced by a ``===DOC n===`` marker (1-based) so
+    Gemini can keep the documents apart and answer them in order.
+    """
+    return "\n\n".join(
+        f"===DOC {i}===\n{text}" for i, text in enumerate(document_texts, start=1)
+    )
+
+
+_models: dict[tuple[str, str | None], Any] = {}
+
+
+def _get_model(model_name: str, system_instruction: str | None = None) -> Any:
+    """
+    Return a GenerativeModel configured for deterministic JSON output.
+
+    Models are cached per (model name, system instruction), so each
+    extractor builds its model once per process and only the document
+    text varies between requests.
+    """
+    key = (model_name, system_instruction)
+    model = _models.get(key)
+    if model is None:
+        model = _models[key] = genai.GenerativeModel(
+            model_name=model_name,
+            system_instruction=system_instruction,
+            generation_config=genai.types.GenerationConfig(
+                temperature=GEMINI_TEMPERATURE,
+                response_mime_type="application/json",
+            ),
+        )
+    return model
+
+
+def _generate_with_retries(
+    model: Any,
+    prompt: str,
+    parse: Callable[[str], Any | None],
+    warnings: list[str],
+) -> tuple[Any | None, str]:
+    """
+    Call *model* with *prompt* until *parse* accepts the response text.
+
+    Retries up to ``GEMINI_MAX_RETRIES`` times with exponential back-off.
+
+    Returns
+    -------
+    (parsed_value_or_None, last_raw_response)
+    """
+    last_raw: str = ""
+    for attempt in range(1, GEMINI_MAX_RETRIES + 1):
+        try:
+            response = model.generate_content(prompt)
+            last_raw = response.text or ""
+        except Exception as exc:  # noqa: BLE001
+            last_raw = ""
+            warnings.append(f"Gemini API error on attempt {attempt}: {exc}")
+            if attempt < GEMINI_MAX_RETRIES:
+                time.sleep(2 ** attempt)
+            continue
+
+        parsed = parse(last_raw)
+        if parsed is not None:
+            return parsed, last_raw
+
+        warnings.append(
+            f"Gemini response was not valid JSON on attempt {attempt}. "
+            f"Raw (first 300 chars): {last_raw[:300]}"
+        )
+        if attempt < GEMINI_MAX_RETRIES:
+            time.sleep(2 ** attempt)
+
+    return None, last_raw
+
+
 def call_gemini(
     prompt: str,
     config: Config,
     model_name: str | None = None,
     warnings: list[str] | None = None,
+    system_instruction: str | None = None,
 ) -> dict[str, Any]:
     """
     Send *prompt* to Gemini and return a parsed JSON dict.
@@ -78,13 +205,16 @@ def call_gemini(
     Parameters
     ----------
     prompt:
-        The complete prompt string (including any document text snippet).
+        The prompt string (including any document text snippet).
     config:
         Validated application configuration.
     model_name:
         Override the model specified in config.
     warnings:
         Mutable list – warning strings are appended if issues occur.
+    system_instruction:
+        Static instructions (rules, JSON structure) for the model; kept out
+        of *prompt* so they are not re-sent as part of every user turn.
 
     Returns
     -------
@@ -95,38 +225,10 @@ def call_gemini(
     if warnings is None:
         warnings = []
 
-    chosen_model = model_name or config.gemini_model
-
-    model = genai.GenerativeModel(
-        model_name=chosen_model,
-        generation_config=genai.types.GenerationConfig(
-            temperature=GEMINI_TEMPERATURE,
-            response_mime_type="application/json",
-        ),
-    )
-
-    last_raw: str = ""
-    for attempt in range(1, GEMINI_MAX_RETRIES + 1):
-        try:
-            response = model.generate_content(prompt)
-            last_raw = response.text or ""
-        except Exception as exc:  # noqa: BLE001
-            last_raw = ""
-            warnings.append(f"Gemini API error on attempt {attempt}: {exc}")
-            if attempt < GEMINI_MAX_RETRIES:
-                time.sleep(2 ** attempt)
-            continue
-
-        parsed = _try_parse_json(last_raw)
-        if parsed is not None:
-            return parsed
-
-        warnings.append(
-            f"Gemini response was not valid JSON on attempt {attempt}. "
-            f"Raw (first 300 chars): {last_raw[:300]}"
-        )
-        if attempt < GEMINI_MAX_RETRIES:
-            time.sleep(2 ** attempt)
+    model = _get_model(model_name or config.gemini_model, system_instruction)
+    parsed, last_raw = _generate_with_retries(model, prompt, _try_parse_json, warnings)
+    if parsed is not None:
+        return parsed
 
     # All retries exhausted.
     warnings.append("Gemini failed to return valid JSON after all retries.")
@@ -134,3 +236,56 @@ def call_gemini(
         "error": "json_parse_failed",
         "raw_response": last_raw[:2000],
     }
+
+
+def call_gemini_batch(
+    prompt: str,
+    config: Config,
+    expected_count: int,
+    model_name: str | None = None,
+    warnings: list[str] | None = None,
+    system_instruction: str | None = None,
+) -> list[dict[str, Any]] | None:
+    """
+    Send a multi-document *prompt* to Gemini and return one dict per document.
+
+    The prompt must ask for a JSON array; the response is accepted only if it
+    holds exactly *expected_count* objects.  Retries like ``call_gemini``.
+
+    Parameters
+    ----------
+    prompt:
+        The complete batched prompt (see ``format_batch_documents``).
+    config:
+        Validated application configuration.
+    expected_count:
+        Number of documents in the prompt.
+    model_name:
+        Override the model specified in config.
+    warnings:
+        Mutable list – warning strings are appended if issues occur.
+    system_instruction:
+        As for ``call_gemini``.
+
+    Returns
+    -------
+    list[dict] | None
+        Parsed extraction dicts in document order, or ``None`` if all retries
+        fail (callers should fall back to per-document extraction).
+    """
+    if warnings is None:
+        warnings = []
+
+    model = _get_model(model_name or config.gemini_model, system_instruction)
+    parsed, _ = _generate_with_retries(
+        model,
+        prompt,
+        lambda raw: _try_parse_json_array(raw, expected_count),
+        warnings,
+    )
+    if parsed is None:
+        warnings.append(
+            f"Gemini failed to return a JSON array of {expected_count} objects "
+            "after all retries."
+        )
+    return parsed
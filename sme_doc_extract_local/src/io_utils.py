@@ -15,17 +15,23 @@ automatically via ``Path.mkdir(parents=True)``.
 from __future__ import annotations
 
 import json
+import shutil
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from src.constants import (
     ALLOWED_EXTENSIONS,
+    FILE_SIGNATURES,
     OUT_DOCAI,
     OUT_EXTRACTION,
     OUT_META,
     OUT_RAW_TEXT,
     OUT_WARNINGS,
+    PDF_HEADER_SEARCH_BYTES,
+    PDF_MIME_TYPE,
 )
 
 
@@ -77,6 +83,42 @@ def collect_files(input_dir: Path) -> list[Path]:
     return sorted(files)
 
 
+_IMAGE_SIGNATURES = tuple(
+    sig
+    for mime, sigs in FILE_SIGNATURES.items()
+    if mime != PDF_MIME_TYPE
+    for sig in sigs
+)
+
+
+def check_file_content(content: bytes, mime_type: str) -> str | None:
+    """
+    Cheap sanity check of an input file before it is sent to Document AI.
+
+    Rejects empty files and files whose leading bytes do not match the
+    signature expected for *mime_type* (e.g. a ``.pdf`` that is really an
+    HTML error page).  Images only need to carry *some* known image
+    signature, since a mislabelled extension (WebP saved as ``.jpg``) is
+    common and Document AI handles it.  Unknown MIME types are not checked.
+
+    Returns
+    -------
+    str | None
+        An error message, or ``None`` if the content looks valid.
+    """
+    if not content:
+        return "File is empty."
+    if mime_type not in FILE_SIGNATURES:
+        return None
+    if mime_type == PDF_MIME_TYPE:
+        head = content[:PDF_HEADER_SEARCH_BYTES]
+        if any(sig in head for sig in FILE_SIGNATURES[PDF_MIME_TYPE]):
+            return None
+    elif content.startswith(_IMAGE_SIGNATURES):
+        return None
+    return f"File content does not look like {mime_type} (unexpected leading bytes)."
+
+
 # ─────────────────────────────────────────────────────────────
 # Individual artefact writers
 # ─────────────────────────────────────────────────────────────
@@ -102,10 +144,23 @@ def write_warnings(pdf_path: Path, outdir: Path, warnings: list[str]) -> Path:
     return dest
 
 
-def write_docai_json(pdf_path: Path, outdir: Path, docai_data: dict[str, Any]) -> Path:
-    """Write the raw Document AI response JSON and return the output path."""
+def write_docai_json(pdf_path: Path, outdir: Path, docai_data: dict[str, Any] | bytes) -> Path:
+    """
+    Write the raw Document AI response JSON and return the output path.
+
+    *docai_data* may be already-encoded JSON bytes, which are written as-is,
+    or a dict, which is serialised with ``orjson`` (the dump can be several
+    MB, so the stdlib encoder is avoided here).
+    """
     dest = stem_outdir(pdf_path, outdir) / OUT_DOCAI
-    _write_json(dest, docai_data)
+    if not isinstance(docai_data, bytes):
+        docai_data = orjson.dumps(
+            docai_data,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_bytes(docai_data)
     return dest
 
 
@@ -128,7 +183,7 @@ def write_all_artifacts(
     extraction_payload: dict[str, Any],
     warnings: list[str],
     meta: dict[str, Any],
-    docai_raw: dict[str, Any] | None = None,
+    docai_raw: dict[str, Any] | bytes | None = None,
     save_docai_json: bool = False,
 ) -> dict[str, Path]:
     """
@@ -142,7 +197,7 @@ def write_all_artifacts(
     extraction_payload: The complete extraction.json dict.
     warnings:       List of warning strings.
     meta:           Meta information dict.
-    docai_raw:      Raw Document AI response (serialisable dict).
+    docai_raw:      Raw Document AI response (serialisable dict or JSON bytes).
     save_docai_json: Whether to persist ``docai.json``.
 
     Returns
@@ -162,6 +217,39 @@ def write_all_artifacts(
     return paths
 
 
+def copy_artifacts(
+    *,
+    src_pdf_path: Path,
+    pdf_path: Path,
+    outdir: Path,
+    source_file: str,
+) -> Path:
+    """
+    Reuse the artefacts written for *src_pdf_path* as those of *pdf_path*.
+
+    Used when two inputs have identical content.  Files are copied as-is,
+    except that ``source_file`` in extraction.json and meta.json is set to
+    *source_file* so each output still points at its own input.
+
+    Returns
+    -------
+    The output sub-directory for *pdf_path*.
+    """
+    src_dir = stem_outdir(src_pdf_path, outdir)
+    dest_dir = stem_outdir(pdf_path, outdir)
+    if dest_dir == src_dir or not src_dir.is_dir():
+        return dest_dir
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    for src in src_dir.iterdir():
+        if src.name in (OUT_EXTRACTION, OUT_META):
+            data = json.loads(src.read_text(encoding="utf-8"))
+            data["source_file"] = source_file
+            _write_json(dest_dir / src.name, data)
+        elif src.is_file():
+            shutil.copyfile(src, dest_dir / src.name)
+    return dest_dir
+
+
 # ─────────────────────────────────────────────────────────────
 # Utility: build the extraction.json payload
 # ─────────────────────────────────────────────────────────────
@@ -173,6 +261,7 @@ def build_extraction_payload(
     extraction: dict[str, Any],
     confidence: dict[str, float],
     warnings: list[str],
+    extraction_method: str = "document_ai + gemini",
 ) -> dict[str, Any]:
     """
     Assemble the canonical extraction.json dict.
@@ -184,6 +273,7 @@ def build_extraction_payload(
     extraction:    Validated extraction fields.
     confidence:    Field-level confidence scores.
     warnings:      Accumulated warning strings.
+    extraction_method: How the fields were extracted.
 
     Returns
     -------
@@ -192,7 +282,7 @@ def build_extraction_payload(
     return {
         "source_file": source_file,
         "doc_type": doc_type,
-        "extraction_method": "document_ai + gemini",
+        "extraction_method": extraction_method,
         "extraction": extraction,
         "confidence": confidence,
         "warnings": warnings,
@@ -205,12 +295,13 @@ def build_meta(
     source_file: str,
     status: str,
     processor_name: str,
-    gemini_model: str,
+    gemini_model: str | None,
     page_count: int,
     elapsed_seconds: float,
     doc_type: str,
     confidence_summary: dict[str, float] | None = None,
     error: str | None = None,
+    extraction_method: str = "document_ai + gemini",
 ) -> dict[str, Any]:
     """
     Build the meta.json dict.
@@ -220,12 +311,13 @@ def build_meta(
     source_file:        Relative path to the source PDF.
     status:             "success" | "failed" | "partial".
     processor_name:     Full Document AI processor resource name.
-    gemini_model:       Gemini model name used.
+    gemini_model:       Gemini model name used, or None if Gemini was skipped.
     page_count:         Number of pages processed by Document AI.
     elapsed_seconds:    Wall-clock seconds for the whole pipeline.
     doc_type:           Detected / forced document type.
     confidence_summary: Average or per-field confidence dict.
     error:              Error message if status == "failed".
+    extraction_method:  How the fields were extracted (as in extraction.json).
 
     Returns
     -------
@@ -237,6 +329,7 @@ def build_meta(
         "doc_type": doc_type,
         "processor": processor_name,
         "gemini_model": gemini_model,
+        "extraction_method": extraction_method,
         "page_count": page_count,
         "elapsed_seconds": round(elapsed_seconds, 3),
         "created_at": datetime.now(tz=timezone.utc).isoformat(),
@@ -9,27 +9,38 @@ Process one file:
 
 Process a directory:
     python -m src.main batch --dir "samples/"
+    python -m src.main batch --dir "samples/" --gemini-batch-size 5
+    python -m src.main batch --dir "samples/" --concurrency 8
 
 Common options:
     --outdir "out/"
     --max-pages N (PDFs only)
     --gemini-model "gemini-2.5-flash"
     --verbose
+    --quiet
 
-Note: docai.json is saved by default for debugging (always included).
+Note: docai.json (raw Document AI response, for debugging) is only written
+when --save-docai-json is passed.
 Document type is always determined automatically via keyword classification
 on the initial OCR output — no manual override is supported.
 """
 from __future__ import annotations
 
 import argparse
+import hashlib
+import importlib
+import itertools
 import json
+import logging
 import os
 import sys
+import threading
 import time
 import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 # Ensure package root (sme_doc_extract_local) is on path so "from src.*" works
 # when run as either "python -m src.main" (from sme_doc_extract_local) or
@@ -39,9 +50,11 @@ if str(_pkg_root) not in sys.path:
     sys.path.insert(0, str(_pkg_root))
 
 from rich.console import Console
+from rich.logging import RichHandler
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
+from rich.text import Text
 
 from src.classify import classify_doc_with_scores
 from src.config import get_config
@@ -64,72 +77,137 @@ from src.constants import (
     DOC_TYPE_UTILITY_BILL,
     DOC_TYPE_LOGISTICS,
     DEFAULT_GEMINI_MODEL,
+    DOCAI_ENTITY_CONFIDENCE_THRESHOLD,
 )
-from src.docai_client import build_client, process_pdf
-from src.docai_normalize import build_enriched_text, normalize
-from src.extractors.invoice_extractor import extract_invoice
-from src.extractors.logistics_extractor import extract_logistics
-from src.extractors.utility_extractor import extract_utility
-from src.gemini_client import configure_gemini
 from src.io_utils import (
     build_extraction_payload,
     build_meta,
+    check_file_content,
     collect_files,
+    copy_artifacts,
     write_all_artifacts,
 )
-from src.validators import validate
+
+# The Document AI / Gemini SDKs (src.docai_client, src.docai_normalize,
+# src.gemini_client, src.extractors.*) and src.validators are imported
+# inside the functions that use them, so --help and the database
+# sub-commands start without paying for those imports.
 
 console = Console()
+log = logging.getLogger(__name__)
+
+# Serialises console output and progress updates from concurrent workers.
+_print_lock = threading.Lock()
+
+
+def _say(message: str, *, verbose: bool, level: int = logging.DEBUG) -> None:
+    """
+    Report a per-file status line.
+
+    Printed (under ``_print_lock``) when *verbose*; otherwise sent to the
+    module logger at *level*.  The CLI routes that logger through ``console``
+    (see ``_configure_logging``), so warnings are drawn above the progress
+    bar and routine DEBUG lines stay hidden.
+    """
+    if verbose:
+        with _print_lock:
+            console.print(message)
+    elif log.isEnabledFor(level):
+        log.log(level, "%s", Text.from_markup(message).plain)
 
 
 # ─────────────────────────────────────────────────────────────
 # Core pipeline helpers
 # ─────────────────────────────────────────────────────────────
 
-def _docai_to_serialisable(document: Any) -> dict:
+def _docai_to_serialisable(document: Any) -> str:
     """
-    Convert a Document AI Document proto to a JSON-serialisable dict.
+    Convert a Document AI Document proto to a JSON string.
 
-    Uses the built-in ``to_json()`` helper from the protobuf/gapic wrapper.
-    Falls back to an empty dict on failure.
+    Uses the proto-plus ``to_json()`` serializer (C-implemented protobuf JSON
+    printer) rather than building a nested dict in Python.  Enum values are
+    written by name and default-valued fields are omitted, matching the
+    previous ``MessageToDict`` output.  Falls back to ``"{}"`` on failure.
     """
     try:
-        import json
-        from google.protobuf.json_format import MessageToDict
-        return MessageToDict(document._pb)  # type: ignore[attr-defined]
-    except Exception:  # noqa: BLE001
+        to_json = type(document).to_json
         try:
-            import json
-            return json.loads(type(document).to_json(document))
-        except Exception:  # noqa: BLE001
-            return {}
+            return to_json(
+                document,
+                use_integers_for_enums=False,
+                always_print_fields_with_no_presence=False,
+            )
+        except TypeError:
+            # proto-plus < 1.24 only knows the older keyword.
+            return to_json(
+                document,
+                use_integers_for_enums=False,
+                including_default_value_fields=False,
+            )
+    except Exception:  # noqa: BLE001
+        return "{}"
+
+
+def _docai_to_json_bytes(document: Any) -> bytes:
+    """Return the Document AI JSON as UTF-8 bytes, ready to write to disk."""
+    return _docai_to_serialisable(document).encode("utf-8")
 
 
-_EXTRACTOR_MAP = {
-    DOC_TYPE_INVOICE:  extract_invoice,
-    DOC_TYPE_UTILITY:  extract_utility,
-    DOC_TYPE_LOGISTICS: extract_logistics,
+def _import_attr(module_name: str, attr: str) -> Callable[[], Any]:
+    """Return a zero-arg loader that imports *module_name* and returns *attr*."""
+    return lambda: getattr(importlib.import_module(module_name), attr)
+
+
+_EXTRACTOR_LOADERS: dict[str, Callable[[], Any]] = {
+    DOC_TYPE_INVOICE:  _import_attr("src.extractors.invoice_extractor", "extract_invoice"),
+    DOC_TYPE_UTILITY:  _import_attr("src.extractors.utility_extractor", "extract_utility"),
+    DOC_TYPE_LOGISTICS: _import_attr("src.extractors.logistics_extractor", "extract_logistics"),
 }
 
-# Maps each classified doc type to the most accurate Document AI processor.
-# invoice  → Invoice Parser  (structured entity extraction)
-# receipt  → Receipt Parser  (structured entity extraction)
-# delivery_receipt / utility_bill → Form Parser (generic OCR)
-# unknown  → Form Parser (fallback)
-_PROCESSOR_MAP: dict[str, Any] = {
-    DOC_TYPE_INVOICE:          lambda cfg: cfg.docai_invoice_processor_name,
-    DOC_TYPE_RECEIPT:          lambda cfg: cfg.docai_receipt_processor_name,
-    DOC_TYPE_DELIVERY_RECEIPT: lambda cfg: cfg.docai_form_processor_name,
-    DOC_TYPE_UTILITY_BILL:     lambda cfg: cfg.docai_form_processor_name,
+# Multi-document variants: one Gemini request for a list of texts.
+_BATCH_EXTRACTOR_LOADERS: dict[str, Callable[[], Any]] = {
+    DOC_TYPE_INVOICE:  _import_attr("src.extractors.invoice_extractor", "extract_invoice_batch"),
+    DOC_TYPE_UTILITY:  _import_attr("src.extractors.utility_extractor", "extract_utility_batch"),
+    DOC_TYPE_LOGISTICS: _import_attr("src.extractors.logistics_extractor", "extract_logistics_batch"),
 }
 
+_resolved_extractors: dict[tuple[str, bool], Callable[..., Any]] = {}
 
-def _processor_for_doc_type(doc_type: str, config: Any) -> str:
-    """Return the Document AI processor resource name for *doc_type*."""
-    getter = _PROCESSOR_MAP.get(doc_type)
-    if getter is not None:
-        return getter(config)
-    return config.docai_form_processor_name
+
+def _get_extractor(extraction_doc_type: str, *, batch: bool = False) -> Callable[..., Any] | None:
+    """
+    Return the (batch) extractor for *extraction_doc_type*, importing it on first use.
+
+    Returns ``None`` if no extractor exists for the type.
+    """
+    key = (extraction_doc_type, batch)
+    extractor = _resolved_extractors.get(key)
+    if extractor is None:
+        loaders = _BATCH_EXTRACTOR_LOADERS if batch else _EXTRACTOR_LOADERS
+        loader = loaders.get(extraction_doc_type)
+        if loader is None:
+            return None
+        extractor = _resolved_extractors[key] = loader()
+    return extractor
+
+
+def build_processor_map(config: Any) -> dict[str, str]:
+    """
+    Map each classified doc type to the most accurate Document AI processor.
+
+    invoice  → Invoice Parser  (structured entity extraction)
+    receipt  → Receipt Parser  (structured entity extraction)
+    delivery_receipt / utility_bill → Form Parser (generic OCR)
+    unknown  → Form Parser (fallback, applied by the caller)
+
+    Built once per run so per-document dispatch is a plain dict lookup.
+    """
+    return {
+        DOC_TYPE_INVOICE:          config.docai_invoice_processor_name,
+        DOC_TYPE_RECEIPT:          config.docai_receipt_processor_name,
+        DOC_TYPE_DELIVERY_RECEIPT: config.docai_form_processor_name,
+        DOC_TYPE_UTILITY_BILL:     config.docai_form_processor_name,
+    }
 
 
 def _doc_type_for_extraction(doc_type: str) -> str:
@@ -145,26 +223,37 @@ def _doc_type_for_extraction(doc_type: str) -> str:
 
 def _call_docai(
     pdf_path: Path,
+    pdf_bytes: bytes,
+    mime_type: str,
     processor_name: str,
     config: Any,
     client: Any,
     max_pages: int | None,
+    verbose: bool,
+    errors: list[str] | None = None,
 ) -> Any | None:
     """
-    Call Document AI and return the Document object.
+    Call Document AI on the already-read file content and return the Document.
 
-    Returns ``None`` on failure and prints an error to the console.
+    Returns ``None`` on failure and reports the error via ``_say``; the
+    exception text is also appended to *errors* when given.
     """
+    from src.docai_client import process_pdf_bytes  # noqa: PLC0415
+
     try:
-        return process_pdf(
-            pdf_path=pdf_path,
+        return process_pdf_bytes(
+            pdf_bytes=pdf_bytes,
+            mime_type=mime_type,
             config=config,
             client=client,
             processor_name=processor_name,
             max_pages=max_pages,
+            display_name=pdf_path.name,
         )
     except Exception as exc:  # noqa: BLE001
-        console.print(f"  [red]✗[/] Document AI failed: {exc}")
+        _say(f"  [red]✗[/] Document AI failed: {exc}", verbose=verbose, level=logging.WARNING)
+        if errors is not None:
+            errors.append(str(exc))
         return None
 
 
@@ -172,48 +261,89 @@ def _call_docai(
 # Pipeline
 # ─────────────────────────────────────────────────────────────
 
-def process_single(
+@dataclass
+class _PreparedDoc:
+    """State carried from the Document AI stage to the Gemini / write stage."""
+
+    pdf_path: Path
+    source_file_str: str
+    t_start: float
+    doc_type: str
+    extraction_doc_type: str
+    target_processor: str
+    document: Any
+    enriched_text: str
+    page_count: int
+    warnings: list[str] = field(default_factory=list)
+    # Set when confident Invoice/Receipt Parser entities replace Gemini.
+    entity_extraction: dict[str, Any] | None = None
+
+
+def _run_docai_stage(
     pdf_path: Path,
     *,
     outdir: Path,
-    max_pages: int | None = None,
+    max_pages: int | None,
     config: Any,
     docai_client: Any,
-    verbose: bool = False,
-) -> dict[str, Any]:
+    processor_by_type: dict[str, str],
+    verbose: bool,
+    pdf_bytes: bytes | None = None,
+) -> _PreparedDoc | dict[str, Any]:
     """
-    Run the full extraction pipeline on a single PDF or image.
+    Run steps 1a–2 of the pipeline (OCR, classification, re-parse, normalise).
 
-    Steps
-    -----
-    1a. Pass 1 OCR with the Form Processor (generic OCR for all file types).
-    1b. Classify the document via keyword matching.
-    1c. Select the most accurate processor for the classified type.
-    1d. Pass 2 — re-parse with the specific processor if it differs from the
-        Form Processor (invoice → Invoice Parser, receipt → Receipt Parser).
-    2.  Normalise Document AI output and build enriched text.
-    3.  Gemini extraction using the type-specific prompt.
-    4.  Validate and normalise Gemini output.
-    5.  Write all artefacts to disk.
+    *pdf_path* is used as given (callers resolve it once up front) and is
+    recorded as ``source_file`` in the artefacts.  *pdf_bytes*, if given, is
+    the file content the caller has already read; otherwise it is read here.
 
-    Returns a summary dict with ``status``, ``doc_type``, ``output_dir``.
+    Returns a ``_PreparedDoc`` ready for Gemini extraction, or – if Pass 1
+    failed – the final summary dict after writing the failure artefacts.
     """
+    from src.docai_client import get_mime_type  # noqa: PLC0415
+    from src.docai_normalize import normalize_and_enrich  # noqa: PLC0415
+
     warnings: list[str] = []
     t_start = time.monotonic()
 
-    pdf_path = Path(pdf_path).resolve()
     source_file_str = str(pdf_path)
     form_processor = config.docai_form_processor_name
 
     # ── Step 1a: Pass 1 – Form Processor OCR ──────────────────
-    if verbose:
-        console.print(f"  [cyan]→[/] Pass 1 OCR on [bold]{pdf_path.name}[/] …")
+    _say(f"  [cyan]→[/] Pass 1 OCR on [bold]{pdf_path.name}[/] …", verbose=verbose)
 
-    document = _call_docai(pdf_path, form_processor, config, docai_client, max_pages)
+    err_msg = "Document AI (Pass 1) failed."
+    document = None
+
+    # Read the file once; Pass 1 and Pass 2 reuse the same buffer.
+    try:
+        if pdf_bytes is None:
+            pdf_bytes = pdf_path.read_bytes()
+        mime_type = get_mime_type(pdf_path)
+    except (OSError, ValueError) as exc:
+        _say(f"  [red]✗[/] Document AI failed: {exc}", verbose=verbose, level=logging.WARNING)
+        err_msg = f"Could not read the file: {exc}"
+    else:
+        # Empty or mislabelled files would only fail remotely; skip the RPC.
+        content_error = check_file_content(pdf_bytes, mime_type)
+        if content_error is not None:
+            _say(
+                f"  [red]✗[/] {pdf_path.name}: {content_error}",
+                verbose=verbose,
+                level=logging.WARNING,
+            )
+            err_msg = f"{content_error} Document AI was not called."
+        else:
+            docai_errors: list[str] = []
+            document = _call_docai(
+                pdf_path, pdf_bytes, mime_type, form_processor, config, docai_client, max_pages,
+                verbose, docai_errors,
+            )
+            if docai_errors:
+                err_msg = f"Document AI (Pass 1) failed: {docai_errors[0]}"
 
     if document is None:
         elapsed = time.monotonic() - t_start
-        err_msg = "Document AI (Pass 1) failed. See console output above."
         meta = build_meta(
             source_file=source_file_str,
             status="failed",
@@ -243,11 +373,10 @@ def process_single(
         return {"status": "failed", "doc_type": DOC_TYPE_UNKNOWN, "output_dir": str(outdir / pdf_path.stem)}
 
     # ── Step 1b: Classify via keyword matching ─────────────────
-    norm = normalize(document)
-    doc_type, scores = classify_doc_with_scores(norm.full_text)
+    bundle = normalize_and_enrich(document)
+    doc_type, scores = classify_doc_with_scores(bundle.full_text)
 
-    if verbose:
-        console.print(f"  [cyan]→[/] Classified as [bold]{doc_type}[/] (scores={scores})")
+    _say(f"  [cyan]→[/] Classified as [bold]{doc_type}[/] (scores={scores})", verbose=verbose)
 
     if doc_type == DOC_TYPE_UNKNOWN:
         warnings.append(
@@ -256,32 +385,33 @@ def process_single(
         )
 
     # ── Step 1c: Select specific processor ────────────────────
-    target_processor = _processor_for_doc_type(doc_type, config)
+    target_processor = processor_by_type.get(doc_type, form_processor)
 
     # ── Step 1d: Pass 2 – re-parse if a better processor exists
+    entity_extraction = None
     if target_processor != form_processor:
-        if verbose:
-            console.print(f"  [cyan]→[/] Pass 2 re-parse with [bold]{target_processor}[/] …")
+        _say(f"  [cyan]→[/] Pass 2 re-parse with [bold]{target_processor}[/] …", verbose=verbose)
 
-        reparse_doc = _call_docai(pdf_path, target_processor, config, docai_client, max_pages)
+        reparse_doc = _call_docai(
+            pdf_path, pdf_bytes, mime_type, target_processor, config, docai_client, max_pages,
+            verbose,
+        )
         if reparse_doc is not None:
             document = reparse_doc
+            bundle = normalize_and_enrich(document)
+            entity_extraction = _confident_entity_extraction(document, doc_type, verbose)
         else:
             warnings.append(
                 f"Pass 2 re-parse failed with processor '{target_processor}'. "
                 "Using Pass 1 OCR output."
             )
 
-    # ── Step 2: Normalise Document AI output ──────────────────
-    norm = normalize(document)
-    enriched_text = build_enriched_text(norm)
-    page_count = norm.page_count
-
-    if verbose:
-        console.print(
-            f"  [green]✓[/] Document AI done. "
-            f"Pages={page_count}, text_chars={len(norm.full_text):,}"
-        )
+    # ── Step 2: Normalised text (reused from Step 1b unless re-parsed)
+    _say(
+        f"  [green]✓[/] Document AI done. "
+        f"Pages={bundle.page_count}, text_chars={len(bundle.full_text):,}",
+        verbose=verbose,
+    )
 
     extraction_doc_type = _doc_type_for_extraction(doc_type)
     if extraction_doc_type != doc_type:
@@ -289,80 +419,444 @@ def process_single(
             f"Using '{extraction_doc_type}' extraction schema for doc_type '{doc_type}'."
         )
 
-    # ── Step 3: Gemini extraction ──────────────────────────────
-    extractor = _EXTRACTOR_MAP.get(extraction_doc_type)
-    raw_extraction: dict[str, Any] = {}
+    return _PreparedDoc(
+        pdf_path=pdf_path,
+        source_file_str=source_file_str,
+        t_start=t_start,
+        doc_type=doc_type,
+        extraction_doc_type=extraction_doc_type,
+        target_processor=target_processor,
+        document=document,
+        enriched_text=bundle.enriched_text,
+        page_count=bundle.page_count,
+        warnings=warnings,
+        entity_extraction=entity_extraction,
+    )
 
-    if extractor is None:
-        warnings.append(
-            f"No extractor for doc_type='{doc_type}'. Skipping Gemini extraction."
+
+def _confident_entity_extraction(document: Any, doc_type: str, verbose: bool) -> dict[str, Any] | None:
+    """
+    Return an invoice extraction built from Document AI entities, if trustworthy.
+
+    Only used for invoices and receipts, only when the parser's mean
+    entity confidence exceeds ``DOCAI_ENTITY_CONFIDENCE_THRESHOLD``, and only
+    when the entities cover the key invoice fields; otherwise Gemini runs.
+    """
+    if _doc_type_for_extraction(doc_type) != DOC_TYPE_INVOICE:
+        return None
+
+    from src.extractors.from_docai_entities import (  # noqa: PLC0415
+        extract_invoice_from_entities,
+        mean_entity_confidence,
+    )
+
+    mean_conf = mean_entity_confidence(document)
+    if mean_conf is None or mean_conf <= DOCAI_ENTITY_CONFIDENCE_THRESHOLD:
+        return None
+    extraction = extract_invoice_from_entities(document)
+    if extraction is not None:
+        _say(
+            f"  [cyan]→[/] Using Document AI entities (mean confidence {mean_conf:.2f}); "
+            "skipping Gemini",
+            verbose=verbose,
         )
-    else:
-        if verbose:
-            console.print(f"  [cyan]→[/] Running Gemini ({config.gemini_model}) …")
-        raw_extraction = extractor(enriched_text, config=config, warnings=warnings)
+    return extraction
+
+
+def _finish_single(
+    prepared: _PreparedDoc,
+    raw_extraction: dict[str, Any],
+    *,
+    outdir: Path,
+    config: Any,
+    verbose: bool,
+    save_docai_json: bool,
+) -> dict[str, Any]:
+    """Run steps 4–5 of the pipeline (validate, write artefacts) for one file."""
+    from src.validators import validate  # noqa: PLC0415
+
+    pdf_path = prepared.pdf_path
+    warnings = prepared.warnings
 
     # ── Step 4: Validate ───────────────────────────────────────
-    normalised, val_warnings, confidence = validate(extraction_doc_type, raw_extraction)
+    # raw_extraction is not used after this point, so validate it in place.
+    normalised, val_warnings, confidence = validate(
+        prepared.extraction_doc_type, raw_extraction, in_place=True
+    )
     warnings.extend(val_warnings)
 
-    elapsed = time.monotonic() - t_start
+    elapsed = time.monotonic() - prepared.t_start
 
     # ── Step 5: Write artefacts ────────────────────────────────
+    used_gemini = prepared.entity_extraction is None
+    extraction_method = "document_ai + gemini" if used_gemini else "document_ai"
     extraction_payload = build_extraction_payload(
-        source_file=source_file_str,
-        doc_type=doc_type,
+        source_file=prepared.source_file_str,
+        doc_type=prepared.doc_type,
         extraction=normalised,
         confidence=confidence,
         warnings=warnings,
+        extraction_method=extraction_method,
     )
 
     meta = build_meta(
-        source_file=source_file_str,
+        source_file=prepared.source_file_str,
         status="success",
-        processor_name=target_processor,
-        gemini_model=config.gemini_model,
-        page_count=page_count,
+        processor_name=prepared.target_processor,
+        gemini_model=config.gemini_model if used_gemini else None,
+        page_count=prepared.page_count,
         elapsed_seconds=elapsed,
-        doc_type=doc_type,
+        doc_type=prepared.doc_type,
         confidence_summary=confidence,
+        extraction_method=extraction_method,
     )
 
-    docai_raw = _docai_to_serialisable(document)
+    # Serialising the Document proto is expensive; only do it when asked to.
+    docai_raw = _docai_to_json_bytes(prepared.document) if save_docai_json else None
 
     paths = write_all_artifacts(
         pdf_path=pdf_path,
         outdir=outdir,
-        raw_text=enriched_text,
+        raw_text=prepared.enriched_text,
         extraction_payload=extraction_payload,
         warnings=warnings,
         meta=meta,
         docai_raw=docai_raw,
-        save_docai_json=True,
+        save_docai_json=save_docai_json,
     )
 
-    if verbose:
-        console.print(
-            f"  [green]✓[/] Artefacts written to [bold]{outdir / pdf_path.stem}[/] "
-            f"({len(paths)} files, {elapsed:.1f}s)"
-        )
+    _say(
+        f"  [green]✓[/] Artefacts written to [bold]{outdir / pdf_path.stem}[/] "
+        f"({len(paths)} files, {elapsed:.1f}s)",
+        verbose=verbose,
+    )
 
     return {
         "status": "success",
-        "doc_type": doc_type,
+        "doc_type": prepared.doc_type,
         "output_dir": str(outdir / pdf_path.stem),
         "warnings": len(warnings),
         "elapsed_seconds": elapsed,
     }
 
 
+def _extract_single(prepared: _PreparedDoc, *, config: Any, verbose: bool) -> dict[str, Any]:
+    """Run step 3 (Gemini extraction) for one prepared document."""
+    if prepared.entity_extraction is not None:
+        return prepared.entity_extraction
+
+    extractor = _get_extractor(prepared.extraction_doc_type)
+    if extractor is None:
+        prepared.warnings.append(
+            f"No extractor for doc_type='{prepared.doc_type}'. Skipping Gemini extraction."
+        )
+        return {}
+
+    _say(f"  [cyan]→[/] Running Gemini ({config.gemini_model}) …", verbose=verbose)
+    return extractor(prepared.enriched_text, config=config, warnings=prepared.warnings)
+
+
+def _failed_result(pdf_path: Path, outdir: Path, exc: Exception, verbose: bool) -> dict[str, Any]:
+    """Report an unexpected per-file error and return its summary dict."""
+    _say(
+        f"  [red]✗[/] Unexpected error on {pdf_path.name}: {exc}",
+        verbose=verbose,
+        level=logging.WARNING,
+    )
+    if verbose:
+        with _print_lock:
+            console.print(traceback.format_exc())
+    return {
+        "status": "failed",
+        "doc_type": DOC_TYPE_UNKNOWN,
+        "output_dir": str(outdir / pdf_path.stem),
+        "warnings": 1,
+        "elapsed_seconds": 0.0,
+        "file": pdf_path.name,
+    }
+
+
+def process_single(
+    pdf_path: Path,
+    *,
+    outdir: Path,
+    max_pages: int | None = None,
+    config: Any,
+    docai_client: Any,
+    processor_by_type: dict[str, str] | None = None,
+    verbose: bool = False,
+    save_docai_json: bool = False,
+) -> dict[str, Any]:
+    """
+    Run the full extraction pipeline on a single PDF or image.
+
+    Steps
+    -----
+    1a. Pass 1 OCR with the Form Processor (generic OCR for all file types).
+    1b. Classify the document via keyword matching.
+    1c. Select the most accurate processor for the classified type.
+    1d. Pass 2 — re-parse with the specific processor if it differs from the
+        Form Processor (invoice → Invoice Parser, receipt → Receipt Parser).
+    2.  Normalise Document AI output and build enriched text.
+    3.  Gemini extraction using the type-specific prompt, unless the Pass 2
+        parser's entities are confident enough to use directly.
+    4.  Validate and normalise Gemini output.
+    5.  Write all artefacts to disk (``docai.json`` only if *save_docai_json*).
+
+    *processor_by_type* is the table from ``build_processor_map``; pass it in
+    when processing many files so it is not rebuilt per document.
+
+    Returns a summary dict with ``status``, ``doc_type``, ``output_dir``.
+    """
+    prepared = _run_docai_stage(
+        pdf_path,
+        outdir=outdir,
+        max_pages=max_pages,
+        config=config,
+        docai_client=docai_client,
+        processor_by_type=processor_by_type or build_processor_map(config),
+        verbose=verbose,
+    )
+    if isinstance(prepared, dict):
+        return prepared
+
+    # ── Step 3: Gemini extraction ──────────────────────────────
+    raw_extraction = _extract_single(prepared, config=config, verbose=verbose)
+
+    return _finish_single(
+        prepared,
+        raw_extraction,
+        outdir=outdir,
+        config=config,
+        verbose=verbose,
+        save_docai_json=save_docai_json,
+    )
+
+
+def process_batch(
+    files: list[Path],
+    *,
+    outdir: Path,
+    max_pages: int | None = None,
+    config: Any,
+    docai_client: Any,
+    processor_by_type: dict[str, str] | None = None,
+    verbose: bool = False,
+    save_docai_json: bool = False,
+    gemini_batch_size: int = 1,
+    concurrency: int = 1,
+    on_progress: Callable[[str, int], None] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Run the pipeline on many files, batching the Gemini step.
+
+    Every file goes through the Document AI stage as in ``process_single``.
+    Prepared documents are queued by extraction schema; once a queue holds
+    *gemini_batch_size* documents (or the input is exhausted) they are sent
+    to Gemini in a single request.  If a batched reply cannot be parsed, that
+    chunk falls back to one request per document.  Each result is then
+    validated and written as in ``process_single``.
+
+    Files with identical content are processed once; the other copies get
+    the same artefacts (see ``copy_artifacts``) and summary.  Duplicates are
+    found from the SHA-256 of the bytes each worker reads for Document AI,
+    so every file is read only once.
+
+    Work runs on a pool of *concurrency* threads.  At most *concurrency*
+    files are in the Document AI stage at once, so memory stays bounded;
+    with the default of 1 files are processed one after another.
+
+    *on_progress* (optional) is called with a description and the number of
+    files completed since the last call, for progress reporting.  It may be
+    called from worker threads.
+
+    Returns one summary dict per input file, in input order.
+    """
+    report = on_progress or (lambda _description, _advance: None)
+    processor_by_type = processor_by_type or build_processor_map(config)
+    batch_size = max(1, gemini_batch_size)
+    concurrency = max(1, concurrency)
+    results: dict[int, dict[str, Any]] = {}
+    pending: dict[str, list[tuple[int, _PreparedDoc]]] = {}
+    # Content digest -> index of the first file seen with it, and each
+    # duplicate's index -> that first index.  Guarded by digest_lock.
+    first_by_digest: dict[str, int] = {}
+    duplicate_of: dict[int, int] = {}
+    digest_lock = threading.Lock()
+
+    def _prepare(idx: int, pdf_path: Path) -> _PreparedDoc | None:
+        """Run steps 1–2 for one file; record and return ``None`` if it ends there."""
+        report(f"[cyan]{pdf_path.name}[/]", 0)
+        try:
+            pdf_bytes: bytes | None = pdf_path.read_bytes()
+        except OSError:
+            pdf_bytes = None  # _run_docai_stage reports the read error
+        else:
+            digest = hashlib.sha256(pdf_bytes).hexdigest()
+            with digest_lock:
+                first = first_by_digest.setdefault(digest, idx)
+                if first != idx:
+                    # Identical to a file already in progress; reuse its results.
+                    duplicate_of[idx] = first
+                    return None
+        try:
+            prepared = _run_docai_stage(
+                pdf_path,
+                outdir=outdir,
+                max_pages=max_pages,
+                config=config,
+                docai_client=docai_client,
+                processor_by_type=processor_by_type,
+                verbose=verbose,
+                pdf_bytes=pdf_bytes,
+            )
+        except Exception as exc:  # noqa: BLE001
+            results[idx] = _failed_result(pdf_path, outdir, exc, verbose)
+            report(f"[cyan]{pdf_path.name}[/]", 1)
+            return None
+        if isinstance(prepared, dict):
+            results[idx] = prepared
+            report(f"[cyan]{pdf_path.name}[/]", 1)
+            return None
+        return prepared
+
+    def _flush(extraction_doc_type: str, chunk: list[tuple[int, _PreparedDoc]]) -> None:
+        """Run Gemini + validate + write for a chunk of documents of one schema."""
+        batch_extractor = _get_extractor(extraction_doc_type, batch=True)
+        raw_extractions: list[dict[str, Any]] | None = None
+
+        # ── Step 3: one Gemini request for the whole chunk ─────
+        if len(chunk) > 1 and batch_extractor is not None:
+            report(f"[cyan]Gemini batch[/] ({len(chunk)} × {extraction_doc_type})", 0)
+            _say(
+                f"  [cyan]→[/] Running Gemini ({config.gemini_model}) on "
+                f"{len(chunk)} {extraction_doc_type} documents in one request …",
+                verbose=verbose,
+            )
+            batch_warnings: list[str] = []
+            try:
+                raw_extractions = batch_extractor(
+                    [prepared.enriched_text for _, prepared in chunk],
+                    config=config,
+                    warnings=batch_warnings,
+                )
+            except Exception as exc:  # noqa: BLE001
+                batch_warnings.append(f"Gemini batch request failed: {exc}")
+            for _, prepared in chunk:
+                prepared.warnings.extend(batch_warnings)
+                if raw_extractions is None:
+                    prepared.warnings.append(
+                        "Batched Gemini extraction failed; retried this document on its own."
+                    )
+
+        # ── Steps 3 (fallback) – 5, per file ───────────────────
+        for pos, (idx, prepared) in enumerate(chunk):
+            try:
+                if raw_extractions is not None:
+                    raw_extraction = raw_extractions[pos]
+                else:
+                    raw_extraction = _extract_single(prepared, config=config, verbose=verbose)
+                results[idx] = _finish_single(
+                    prepared,
+                    raw_extraction,
+                    outdir=outdir,
+                    config=config,
+                    verbose=verbose,
+                    save_docai_json=save_docai_json,
+                )
+            except Exception as exc:  # noqa: BLE001
+                results[idx] = _failed_result(prepared.pdf_path, outdir, exc, verbose)
+            report(f"[cyan]{prepared.pdf_path.name}[/]", 1)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        todo = enumerate(files)
+        in_flight: dict[Future, int] = {}
+        flushes: list[Future] = []
+
+        def _submit_flush(extraction_doc_type: str) -> None:
+            flushes.append(
+                pool.submit(_flush, extraction_doc_type, pending.pop(extraction_doc_type))
+            )
+
+        # ── Steps 1–2: Document AI, queueing by extraction schema ──
+        while True:
+            for idx, pdf_path in itertools.islice(todo, concurrency - len(in_flight)):
+                in_flight[pool.submit(_prepare, idx, pdf_path)] = idx
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = in_flight.pop(future)
+                prepared = future.result()
+                if prepared is None:
+                    continue
+                doc_type = prepared.extraction_doc_type
+                if prepared.entity_extraction is not None:
+                    # No Gemini call needed; validate and write straight away.
+                    flushes.append(pool.submit(_flush, doc_type, [(idx, prepared)]))
+                    continue
+                queue = pending.setdefault(doc_type, [])
+                queue.append((idx, prepared))
+                if len(queue) >= batch_size or doc_type not in _BATCH_EXTRACTOR_LOADERS:
+                    _submit_flush(doc_type)
+
+        for extraction_doc_type in list(pending):
+            _submit_flush(extraction_doc_type)
+        for future in flushes:
+            future.result()
+
+    # ── Duplicates: reuse the first copy's artefacts ───────────
+    for idx, first in sorted(duplicate_of.items()):
+        pdf_path = files[idx]
+        _say(
+            f"  [cyan]→[/] {pdf_path.name} is identical to {files[first].name}; reusing its results",
+            verbose=verbose,
+        )
+        try:
+            dest_dir = copy_artifacts(
+                src_pdf_path=files[first],
+                pdf_path=pdf_path,
+                outdir=outdir,
+                source_file=str(pdf_path),
+            )
+        except (OSError, ValueError) as exc:
+            results[idx] = _failed_result(pdf_path, outdir, exc, verbose)
+        else:
+            results[idx] = {**results[first], "file": pdf_path.name, "output_dir": str(dest_dir)}
+        report(f"[cyan]{pdf_path.name}[/]", 1)
+
+    ordered: list[dict[str, Any]] = []
+    for idx, pdf_path in enumerate(files):
+        result = results[idx]
+        result.setdefault("file", pdf_path.name)
+        ordered.append(result)
+    return ordered
+
+
 # ─────────────────────────────────────────────────────────────
 # CLI commands
 # ─────────────────────────────────────────────────────────────
 
+def _configure_logging(args: argparse.Namespace) -> None:
+    """
+    Send the module logger to ``console`` so it cooperates with ``Progress``.
+
+    Per-file warnings are shown by default; --quiet raises the level to
+    ERROR so only the results table remains.
+    """
+    level = logging.ERROR if args.quiet else logging.WARNING
+    if not log.handlers:
+        handler = RichHandler(console=console, show_time=False, show_path=False)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.propagate = False
+    log.setLevel(level)
+
+
 def cmd_process(args: argparse.Namespace) -> int:
     """Handle: python -m src.main process --file ..."""
-    pdf_path = Path(args.file)
+    _configure_logging(args)
+    pdf_path = Path(args.file).resolve()
     if not pdf_path.exists():
         console.print(f"[red]Error:[/] File not found: {pdf_path}")
         return 1
@@ -373,6 +867,9 @@ def cmd_process(args: argparse.Namespace) -> int:
         console.print(f"[red]Config error:[/] {exc}")
         return 1
 
+    from src.docai_client import build_client  # noqa: PLC0415
+    from src.gemini_client import configure_gemini  # noqa: PLC0415
+
     configure_gemini(config)
     docai_client = build_client(config)
     outdir = Path(args.outdir)
@@ -385,7 +882,9 @@ def cmd_process(args: argparse.Namespace) -> int:
         max_pages=args.max_pages,
         config=config,
         docai_client=docai_client,
+        processor_by_type=build_processor_map(config),
         verbose=args.verbose,
+        save_docai_json=args.save_docai_json,
     )
 
     _print_result_table([result])
@@ -394,12 +893,14 @@ def cmd_process(args: argparse.Namespace) -> int:
 
 def cmd_batch(args: argparse.Namespace) -> int:
     """Handle: python -m src.main batch --dir ..."""
+    _configure_logging(args)
     src_dir = Path(args.dir)
     if not src_dir.is_dir():
         console.print(f"[red]Error:[/] Directory not found: {src_dir}")
         return 1
 
-    files = collect_files(src_dir)
+    # Resolve once here; the pipeline uses these paths as given.
+    files = [f.resolve() for f in collect_files(src_dir)]
     if not files:
         console.print(f"[yellow]Warning:[/] No PDF or image files found in {src_dir}")
         return 0
@@ -410,6 +911,9 @@ def cmd_batch(args: argparse.Namespace) -> int:
         console.print(f"[red]Config error:[/] {exc}")
         return 1
 
+    from src.docai_client import build_client  # noqa: PLC0415
+    from src.gemini_client import configure_gemini  # noqa: PLC0415
+
     configure_gemini(config)
     docai_client = build_client(config)
     outdir = Path(args.outdir)
@@ -421,39 +925,32 @@ def cmd_batch(args: argparse.Namespace) -> int:
         )
     )
 
-    results: list[dict] = []
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console,
+        refresh_per_second=4,
+        transient=True,
     ) as progress:
         task = progress.add_task("Processing …", total=len(files))
-        for pdf_path in files:
-            progress.update(task, description=f"[cyan]{pdf_path.name}[/]")
-            try:
-                result = process_single(
-                    pdf_path=pdf_path,
-                    outdir=outdir,
-                    max_pages=args.max_pages,
-                    config=config,
-                    docai_client=docai_client,
-                    verbose=args.verbose,
-                )
-            except Exception as exc:  # noqa: BLE001
-                console.print(f"  [red]✗[/] Unexpected error on {pdf_path.name}: {exc}")
-                if args.verbose:
-                    console.print(traceback.format_exc())
-                result = {
-                    "status": "failed",
-                    "doc_type": DOC_TYPE_UNKNOWN,
-                    "output_dir": str(outdir / pdf_path.stem),
-                    "warnings": 1,
-                    "elapsed_seconds": 0.0,
-                    "file": pdf_path.name,
-                }
-            result.setdefault("file", pdf_path.name)
-            results.append(result)
-            progress.advance(task)
+
+        def _on_progress(description: str, advance: int) -> None:
+            with _print_lock:
+                progress.update(task, description=description, advance=advance)
+
+        results = process_batch(
+            files,
+            outdir=outdir,
+            max_pages=args.max_pages,
+            config=config,
+            docai_client=docai_client,
+            processor_by_type=build_processor_map(config),
+            verbose=args.verbose,
+            save_docai_json=args.save_docai_json,
+            gemini_batch_size=args.gemini_batch_size,
+            concurrency=args.concurrency,
+            on_progress=_on_progress,
+        )
 
     _print_result_table(results)
     failed = sum(1 for r in results if r["status"] != "success")
@@ -647,9 +1144,9 @@ def _build_shared_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--save-docai-json",
         action="store_true",
-        default=True,
+        default=False,
         dest="save_docai_json",
-        help="Save raw Document AI response as docai.json (default: on)",
+        help="Save raw Document AI response as docai.json for debugging (default: off)",
     )
     parser.add_argument(
         "--max-pages",
@@ -670,6 +1167,12 @@ def _build_shared_args(parser: argparse.ArgumentParser) -> None:
         default=False,
         help="Print detailed progress to console",
     )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        default=False,
+        help="Only print the results table, not per-file error messages",
+    )
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -696,6 +1199,19 @@ def build_parser() -> argparse.ArgumentParser:
         required=True,
         help='Directory containing PDF/image files, e.g. "samples/"',
     )
+    p_batch.add_argument(
+        "--gemini-batch-size",
+        type=int,
+        default=1,
+        dest="gemini_batch_size",
+        help="Send up to N documents of the same type to Gemini in one request (default: 1)",
+    )
+    p_batch.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of files to process in parallel (default: 1)",
+    )
     _build_shared_args(p_batch)
 
     # ── ingest (load extraction.json into database) ──────────────
@@ -17,6 +17,8 @@ whether to propagate warnings to the output.
 from __future__ import annotations
 
 import re
+from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 from dateutil import parser as dateutil_parser
@@ -35,6 +37,19 @@ from src.constants import (
 # Helpers
 # ─────────────────────────────────────────────────────────────
 
+# Compiled once; both run for every numeric / date field validated.
+_CURRENCY_RE = re.compile(r"[,$€£¥\s]")
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Common non-ISO layouts tried with strptime before falling back to
+# dateutil.  Month-first, matching dateutil's dayfirst=False.
+_DATE_FORMATS = ("%m/%d/%Y", "%d-%b-%Y", "%Y/%m/%d")
+
+# Allowed values as shown in warnings, sorted once rather than per warning.
+_UTILITY_TYPES_DISPLAY = str(sorted(UTILITY_ALLOWED_TYPES))
+_LOGISTICS_MODES_DISPLAY = str(sorted(LOGISTICS_ALLOWED_MODES))
+
+
 def _to_float(value: Any) -> float | None:
     """
     Try to convert *value* to float.
@@ -47,7 +62,13 @@ def _to_float(value: Any) -> float | None:
     if isinstance(value, (int, float)):
         return float(value)
     if isinstance(value, str):
-        cleaned = re.sub(r"[,$€£¥\s]", "", value)
+        # Plain numbers (e.g. Document AI's normalised amounts) need no
+        # cleaning; float() already ignores surrounding whitespace.
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        cleaned = _CURRENCY_RE.sub("", value)
         try:
             return float(cleaned)
         except ValueError:
@@ -55,6 +76,35 @@ def _to_float(value: Any) -> float | None:
     return None
 
 
+@lru_cache(maxsize=4096)
+def _parse_iso_cached(text: str) -> str | None:
+    """
+    Parse a date string to YYYY-MM-DD, memoised.
+
+    The same dates recur across documents and line items, and dateutil is
+    the slowest step of validation, so each distinct string is parsed once.
+    """
+    # Already ISO?
+    if _ISO_DATE_RE.fullmatch(text):
+        return text
+    # ISO with a time part (C-implemented), then the common layouts.
+    try:
+        return datetime.fromisoformat(text).strftime("%Y-%m-%d")
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    # Anything else: dateutil (slow, pure Python).
+    try:
+        dt = dateutil_parser.parse(text, dayfirst=False)
+        return dt.strftime("%Y-%m-%d")
+    except (ValueError, OverflowError):
+        return None
+
+
 def _to_iso_date(value: Any) -> str | None:
     """
     Parse *value* as a date and return YYYY-MM-DD string.
@@ -68,14 +118,17 @@ def _to_iso_date(value: Any) -> str | None:
         value = value.strip()
         if not value:
             return None
-        # Already ISO?
-        if re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):
-            return value
-    try:
-        dt = dateutil_parser.parse(str(value), dayfirst=False)
-        return dt.strftime("%Y-%m-%d")
-    except (ValueError, OverflowError):
-        return None
+        return _parse_iso_cached(value)
+    return _parse_iso_cached(str(value))
+
+
+def _set_date(d: dict[str, Any], field: str, warnings: list[str]) -> str | None:
+    """Normalise ``d[field]`` to an ISO date in place, warning if it could not be parsed."""
+    original = d.get(field)
+    parsed = d[field] = _to_iso_date(original)
+    if original and parsed is None:
+        warnings.append(f"Could not parse {field}: '{original}'")
+    return parsed
 
 
 def _confidence(value: Any, valid: bool) -> float:
@@ -91,28 +144,31 @@ def _confidence(value: Any, valid: bool) -> float:
 
 def validate_invoice(
     raw: dict[str, Any],
+    *,
+    in_place: bool = False,
 ) -> tuple[dict[str, Any], list[str], dict[str, float]]:
     """
     Normalise and validate an invoice extraction dict.
 
+    With ``in_place=True`` *raw* itself is normalised and returned instead
+    of a copy; line items are always rebuilt.
+
     Returns
     -------
     (normalised_dict, warnings, confidence_map)
     """
     warnings: list[str] = []
     conf: dict[str, float] = {}
-    d = dict(raw)
+    d = raw if in_place else dict(raw)
 
     # -- Numeric fields --
-    for field in ("subtotal", "tax", "total"):
-        d[field] = _to_float(d.get(field))
+    sub = d["subtotal"] = _to_float(d.get("subtotal"))
+    tax = d["tax"] = _to_float(d.get("tax"))
+    total = d["total"] = _to_float(d.get("total"))
 
     # -- Date fields --
-    for field in ("invoice_date", "due_date"):
-        original = d.get(field)
-        d[field] = _to_iso_date(original)
-        if original and d[field] is None:
-            warnings.append(f"Could not parse {field}: '{original}'")
+    invoice_date = _set_date(d, "invoice_date", warnings)
+    _set_date(d, "due_date", warnings)
 
     # -- Line items --
     normalised_items = []
@@ -125,10 +181,6 @@ def validate_invoice(
     d["line_items"] = normalised_items
 
     # -- Consistency check: subtotal + tax ≈ total --
-    sub = d.get("subtotal")
-    tax = d.get("tax")
-    total = d.get("total")
-
     total_consistent = True
     if sub is not None and tax is not None and total is not None:
         calc = sub + tax
@@ -146,7 +198,7 @@ def validate_invoice(
     # -- Confidence --
     conf["vendor_name"] = _confidence(d.get("vendor_name"), True)
     conf["invoice_number"] = _confidence(d.get("invoice_number"), True)
-    conf["invoice_date"] = _confidence(d.get("invoice_date"), d.get("invoice_date") is not None)
+    conf["invoice_date"] = _confidence(invoice_date, invoice_date is not None)
     conf["subtotal"] = _confidence(sub, sub is None or sub >= 0)
     conf["tax"] = _confidence(tax, tax is None or tax >= 0)
     conf["total"] = _confidence(total, total_consistent and (total is None or total >= 0))
@@ -160,21 +212,26 @@ def validate_invoice(
 
 def validate_utility(
     raw: dict[str, Any],
+    *,
+    in_place: bool = False,
 ) -> tuple[dict[str, Any], list[str], dict[str, float]]:
     """
     Normalise and validate a utility-bill extraction dict.
 
+    With ``in_place=True`` *raw* itself is normalised and returned instead
+    of a copy.
+
     Returns
     -------
     (normalised_dict, warnings, confidence_map)
     """
     warnings: list[str] = []
     conf: dict[str, float] = {}
-    d = dict(raw)
+    d = raw if in_place else dict(raw)
 
     # -- Location (city, state) --
     loc = d.get("location")
-    d["location"] = loc.strip() if isinstance(loc, str) and loc else None
+    loc = d["location"] = loc.strip() if isinstance(loc, str) and loc else None
 
     # -- Utility type (gas, water, electricity, other) --
     utility_type = d.get("utility_type")
@@ -186,7 +243,7 @@ def validate_utility(
         else:
             warnings.append(
                 f"utility_type '{utility_type}' is not allowed; expected one of "
-                f"{sorted(UTILITY_ALLOWED_TYPES)}. Setting null."
+                f"{_UTILITY_TYPES_DISPLAY}. Setting null."
             )
             d["utility_type"] = None
             utility_type_valid = False
@@ -195,22 +252,19 @@ def validate_utility(
 
     # -- Water unit (strip string) --
     wu = d.get("water_unit")
-    d["water_unit"] = wu.strip() if isinstance(wu, str) and wu else None
+    wu = d["water_unit"] = wu.strip() if isinstance(wu, str) and wu else None
 
     # -- Numeric fields --
-    for field in ("electricity_kwh", "natural_gas_therms", "water_volume", "total_amount"):
-        d[field] = _to_float(d.get(field))
+    kwh = d["electricity_kwh"] = _to_float(d.get("electricity_kwh"))
+    therms = d["natural_gas_therms"] = _to_float(d.get("natural_gas_therms"))
+    water_vol = d["water_volume"] = _to_float(d.get("water_volume"))
+    total_amount = d["total_amount"] = _to_float(d.get("total_amount"))
 
     # -- Date fields --
-    for field in ("billing_period_start", "billing_period_end"):
-        original = d.get(field)
-        d[field] = _to_iso_date(original)
-        if original and d[field] is None:
-            warnings.append(f"Could not parse {field}: '{original}'")
+    start = _set_date(d, "billing_period_start", warnings)
+    end = _set_date(d, "billing_period_end", warnings)
 
     # -- Period order --
-    start = d.get("billing_period_start")
-    end = d.get("billing_period_end")
     period_valid = True
     if start and end:
         if start > end:
@@ -220,30 +274,27 @@ def validate_utility(
             period_valid = False
 
     # -- Non-negative usage --
-    kwh = d.get("electricity_kwh")
     if kwh is not None and kwh < 0:
         warnings.append(f"electricity_kwh is negative ({kwh})")
 
-    therms = d.get("natural_gas_therms")
     if therms is not None and therms < 0:
         warnings.append(f"natural_gas_therms is negative ({therms})")
 
-    water_vol = d.get("water_volume")
     water_volume_valid = water_vol is None or water_vol >= 0
-    if water_vol is not None and water_vol < 0:
+    if not water_volume_valid:
         warnings.append(f"water_volume is negative ({water_vol})")
 
     # -- Confidence --
     conf["provider"] = _confidence(d.get("provider"), True)
     conf["account_id"] = _confidence(d.get("account_id"), True)
-    conf["location"] = _confidence(d.get("location"), True)
-    conf["utility_type"] = _confidence(d.get("utility_type"), utility_type_valid)
+    conf["location"] = _confidence(loc, True)
+    conf["utility_type"] = _confidence(d["utility_type"], utility_type_valid)
     conf["billing_period_start"] = _confidence(start, period_valid and start is not None)
     conf["billing_period_end"] = _confidence(end, period_valid and end is not None)
     conf["electricity_kwh"] = _confidence(kwh, kwh is None or kwh >= 0)
     conf["water_volume"] = _confidence(water_vol, water_volume_valid)
-    conf["water_unit"] = _confidence(d.get("water_unit"), True)
-    conf["total_amount"] = _confidence(d.get("total_amount"), True)
+    conf["water_unit"] = _confidence(wu, True)
+    conf["total_amount"] = _confidence(total_amount, True)
 
     return d, warnings, conf
 
@@ -254,21 +305,26 @@ def validate_utility(
 
 def validate_logistics(
     raw: dict[str, Any],
+    *,
+    in_place: bool = False,
 ) -> tuple[dict[str, Any], list[str], dict[str, float]]:
     """
     Normalise and validate a logistics extraction dict.
 
+    With ``in_place=True`` *raw* itself is normalised and returned instead
+    of a copy.
+
     Returns
     -------
     (normalised_dict, warnings, confidence_map)
     """
     warnings: list[str] = []
     conf: dict[str, float] = {}
-    d = dict(raw)
+    d = raw if in_place else dict(raw)
 
     # -- Numeric fields --
-    for field in ("distance_km", "weight_kg"):
-        d[field] = _to_float(d.get(field))
+    dist = d["distance_km"] = _to_float(d.get("distance_km"))
+    weight = d["weight_kg"] = _to_float(d.get("weight_kg"))
 
     packages = d.get("packages_count")
     if packages is not None:
@@ -279,10 +335,7 @@ def validate_logistics(
             d["packages_count"] = None
 
     # -- Date --
-    original_date = d.get("date")
-    d["date"] = _to_iso_date(original_date)
-    if original_date and d["date"] is None:
-        warnings.append(f"Could not parse date: '{original_date}'")
+    _set_date(d, "date", warnings)
 
     # -- Mode --
     mode = d.get("mode")
@@ -294,17 +347,15 @@ def validate_logistics(
         else:
             warnings.append(
                 f"mode '{mode}' is not allowed; expected one of "
-                f"{sorted(LOGISTICS_ALLOWED_MODES)}. Setting null."
+                f"{_LOGISTICS_MODES_DISPLAY}. Setting null."
             )
             d["mode"] = None
             mode_valid = False
 
     # -- Non-negative numerics --
-    dist = d.get("distance_km")
     if dist is not None and dist < 0:
         warnings.append(f"distance_km is negative ({dist})")
 
-    weight = d.get("weight_kg")
     if weight is not None and weight < 0:
         warnings.append(f"weight_kg is negative ({weight})")
 
@@ -334,13 +385,35 @@ _VALIDATOR_MAP = {
 def validate(
     doc_type: str,
     raw: dict[str, Any],
+    *,
+    in_place: bool = False,
 ) -> tuple[dict[str, Any], list[str], dict[str, float]]:
     """
     Dispatch to the correct validator based on *doc_type*.
 
-    Falls back to returning the raw dict unchanged if the type is unknown.
+    Pass ``in_place=True`` when the caller no longer needs *raw* to skip
+    copying it.  Falls back to returning the raw dict unchanged if the type
+    is unknown.
     """
     fn = _VALIDATOR_MAP.get(doc_type)
     if fn is None:
         return raw, [f"No validator for doc_type='{doc_type}'"], {}
-    return fn(raw)
+    return fn(raw, in_place=in_place)
+
+
+def validate_many(
+    doc_type: str,
+    docs: list[dict[str, Any]],
+    *,
+    in_place: bool = False,
+) -> list[tuple[dict[str, Any], list[str], dict[str, float]]]:
+    """
+    Validate several extractions of the same *doc_type*.
+
+    Same results as calling :func:`validate` on each dict, but the validator
+    is looked up once for the whole list.
+    """
+    fn = _VALIDATOR_MAP.get(doc_type)
+    if fn is None:
+        return [(raw, [f"No validator for doc_type='{doc_type}'"], {}) for raw in docs]
+    return [fn(raw, in_place=in_place) for raw in docs]
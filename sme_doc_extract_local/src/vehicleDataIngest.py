@@ -6,7 +6,8 @@ Steps:
   1. Parse and aggregate CSV rows by (period_start, period_end, fuel_type, unit).
   2. Insert one synthetic row into documents (document_type='vehicle_fuel_csv_import')
      to satisfy the FK constraint.
-  3. Insert the merged fuel rows into parsed_vehicle_fuel with the new document_id.
+  3. Stream the merged fuel rows into parsed_vehicle_fuel with the new document_id
+     using a single COPY.
 
 fuel_type and unit values from the CSV are normalised to match the CHECK constraints:
   fuel_type: 'Gasoline' -> 'gasoline', 'Diesel' -> 'diesel'
@@ -19,13 +20,15 @@ Uses DATABASE_URL from environment (.env). Run from package root:
 from __future__ import annotations
 
 import csv
+import io
 import json
 import os
-from dataclasses import dataclass
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import List, Tuple
 
-from psycopg2.extras import Json, execute_values
+from psycopg2.extras import Json
 
 from src.db import get_connection
 
@@ -53,10 +56,14 @@ _UNIT_MAP: dict[str, str] = {
 }
 
 
+# The CSV repeats a handful of raw spellings on every row, so the cached
+# normalisers skip the strip/lower after the first occurrence.
+@lru_cache(maxsize=64)
 def _normalise_fuel_type(raw: str) -> str | None:
     return _FUEL_TYPE_MAP.get(raw.strip().lower())
 
 
+@lru_cache(maxsize=64)
 def _normalise_unit(raw: str) -> str | None:
     return _UNIT_MAP.get(raw.strip().lower())
 
@@ -65,12 +72,13 @@ def _normalise_unit(raw: str) -> str | None:
 # CSV parsing and aggregation
 # ─────────────────────────────────────────────────────────────────────────────
 
-@dataclass(frozen=True)
-class FuelAggKey:
-    period_start: str
-    period_end: str
-    fuel_type: str   # already normalised
-    unit: str        # already normalised
+# Aggregation key: (period_start, period_end, fuel_type, unit), with fuel_type
+# and unit already normalised.  Plain tuples hash and compare in C, and their
+# element order is the sort order of the merged rows.
+FuelAggKey = Tuple[str, str, str, str]
+
+# CSV columns read by _parse_and_merge, in the order their indices are unpacked.
+_CSV_COLUMNS = ("period_start", "period_end", "fuel_type", "unit", "fuel_consumed")
 
 
 def _parse_and_merge(csv_path: Path) -> List[Tuple[str, float, str, str, str]]:
@@ -79,17 +87,33 @@ def _parse_and_merge(csv_path: Path) -> List[Tuple[str, float, str, str, str]]:
     Quantity is the SUM of fuel_consumed.
 
     Returns rows as (fuel_type, quantity, unit, period_start, period_end).
-    Rows with unrecognised fuel_type or unit are skipped (logged to stdout).
+    Rows with unrecognised fuel_type or unit, or a blank period_start or
+    period_end, are skipped (logged to stdout).  Blank periods must not reach
+    the COPY in push_fuel_to_postgres, which would load them as NULL.
+    Raises ValueError if the header lacks one of the expected columns.
     """
-    merged: Dict[FuelAggKey, float] = {}
+    merged: defaultdict[FuelAggKey, float] = defaultdict(float)
 
     with csv_path.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        missing = [name for name in _CSV_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"{csv_path.name}: missing CSV columns {missing}")
+        columns = [header.index(name) for name in _CSV_COLUMNS]
+        i_start, i_end, i_fuel, i_unit, i_qty = columns
+        min_len = max(columns) + 1
+
         for row in reader:
-            raw_fuel = row.get("fuel_type", "")
-            raw_unit = row.get("unit", "")
-            period_start = row.get("period_start", "").strip()
-            period_end = row.get("period_end", "").strip()
+            if len(row) < min_len:
+                continue  # blank or truncated line
+            raw_fuel = row[i_fuel]
+            raw_unit = row[i_unit]
+            period_start = row[i_start].strip()
+            period_end = row[i_end].strip()
+            if not period_start or not period_end:
+                print(f"  [skip] missing period ({period_start!r}, {period_end!r})")
+                continue
 
             fuel_type = _normalise_fuel_type(raw_fuel)
             unit = _normalise_unit(raw_unit)
@@ -102,24 +126,15 @@ def _parse_and_merge(csv_path: Path) -> List[Tuple[str, float, str, str, str]]:
                 continue
 
             try:
-                qty = float(row.get("fuel_consumed", 0))
-            except (ValueError, TypeError):
+                qty = float(row[i_qty])
+            except ValueError:
                 continue
 
-            key = FuelAggKey(
-                period_start=period_start,
-                period_end=period_end,
-                fuel_type=fuel_type,
-                unit=unit,
-            )
-            merged[key] = merged.get(key, 0.0) + qty
+            merged[(period_start, period_end, fuel_type, unit)] += qty
 
     return [
-        (key.fuel_type, qty, key.unit, key.period_start, key.period_end)
-        for key, qty in sorted(
-            merged.items(),
-            key=lambda x: (x[0].period_start, x[0].fuel_type, x[0].unit),
-        )
+        (fuel_type, qty, unit, period_start, period_end)
+        for (period_start, period_end, fuel_type, unit), qty in sorted(merged.items())
     ]
 
 
@@ -135,7 +150,7 @@ def push_fuel_to_postgres(
     Insert aggregated vehicle fuel rows from the CSV into parsed_vehicle_fuel.
 
     Creates one row in documents (document_type='vehicle_fuel_csv_import') to satisfy
-    the FK constraint, then batch-inserts the merged rows into parsed_vehicle_fuel.
+    the FK constraint, then COPYs the merged rows into parsed_vehicle_fuel.
 
     Returns the number of merged rows inserted.
     """
@@ -144,6 +159,10 @@ def push_fuel_to_postgres(
         print("No valid rows to insert.")
         return 0
 
+    # Document row values, built before the connection is opened.
+    doc_type = "vehicle_fuel_csv_import"
+    exported_json = Json({"source_file": str(csv_path), "doc_type": doc_type})
+
     conn = get_connection(database_url)
     conn.autocommit = False
 
@@ -156,32 +175,28 @@ def push_fuel_to_postgres(
                 VALUES (%s, %s, %s)
                 RETURNING document_id
                 """,
-                (
-                    "vehicle_fuel_csv_import",
-                    csv_path.name,
-                    Json({"source_file": str(csv_path), "doc_type": "vehicle_fuel_csv_import"}),
-                ),
+                (doc_type, csv_path.name, exported_json),
             )
             row = cur.fetchone()
             document_id = row[0] if row else None
             if not document_id:
                 raise RuntimeError("Failed to obtain document_id for CSV import.")
 
-            # Attach document_id to each fuel row.
-            rows_with_doc_id = [
+            # Attach document_id to each fuel row and load them in one COPY,
+            # which skips per-row statement parsing on the server.
+            buf = io.StringIO()
+            csv.writer(buf).writerows(
                 (document_id, fuel_type, qty, unit, period_start, period_end)
                 for fuel_type, qty, unit, period_start, period_end in merged_rows
-            ]
-
-            execute_values(
-                cur,
+            )
+            buf.seek(0)
+            cur.copy_expert(
                 """
-                INSERT INTO parsed_vehicle_fuel
+                COPY parsed_vehicle_fuel
                     (document_id, fuel_type, quantity, unit, period_start, period_end)
-                VALUES %s
+                FROM STDIN WITH (FORMAT csv)
                 """,
-                rows_with_doc_id,
-                page_size=200,
+                buf,
             )
 
         conn.commit()
@@ -1,13 +1,14 @@
 """
 Unit tests for src/calculations.py
 
-No real DB connection is used. Each test builds a mock psycopg2 connection
+No real DB connection is used. Each test builds a fake psycopg2 connection
 that satisfies the `with conn.cursor() as cur:` pattern used in calculations.py.
 _upsert_activity and _upsert_emission are patched out so only the
-calculation math is exercised.
+calculation math is exercised (see _stub_emission_calc).
 """
 import pytest
 from unittest.mock import MagicMock, patch, call
+from src import calculations
 from src.calculations import (
     calc_electricity_emissions,
     calc_stationary_fuel_emissions,
@@ -23,34 +24,92 @@ from src.calculations import (
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Helper: build a mock psycopg2 connection
+# Helper: build a fake psycopg2 connection
 #
 # calculations.py always does:
 #     with conn.cursor() as cur:
 #         cur.execute(...)
 #         rows = cur.fetchall()   # or cur.fetchone()
 #
-# The mock must support that context-manager protocol.
+# The fakes implement just that protocol plus conn.commit(); plain classes
+# are much cheaper to build than MagicMock and fail loudly on anything else.
+# The emission classes' canned SELECT rows are module constants; the
+# calculators never mutate them, so the same list is shared between tests.
 # ─────────────────────────────────────────────────────────────────────────────
 
+class _FakeCursor:
+    def __init__(self, fetchall_rows, fetchone_row):
+        self._fetchall_rows = fetchall_rows
+        self._fetchone_row = fetchone_row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchall(self):
+        return self._fetchall_rows
+
+    def fetchone(self):
+        return self._fetchone_row
+
+
+class _FakeConn:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commit_calls = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commit_calls += 1
+
+
 def make_conn(fetchall_rows=None, fetchone_row=None):
     """
-    Returns (mock_conn, mock_cursor).
+    Returns (fake_conn, fake_cursor).
 
-    mock_cursor.fetchall() → fetchall_rows  (default [])
-    mock_cursor.fetchone() → fetchone_row   (default (1,) — fake activity_id)
+    fake_cursor.fetchall() → fetchall_rows  (default [])
+    fake_cursor.fetchone() → fetchone_row   (default (1,) — fake activity_id)
     """
-    mock_cursor = MagicMock()
-    mock_cursor.fetchall.return_value = fetchall_rows if fetchall_rows is not None else []
-    mock_cursor.fetchone.return_value = fetchone_row if fetchone_row is not None else (1,)
+    cursor = _FakeCursor(
+        fetchall_rows if fetchall_rows is not None else [],
+        fetchone_row if fetchone_row is not None else (1,),
+    )
+    return _FakeConn(cursor), cursor
 
-    mock_ctx = MagicMock()
-    mock_ctx.__enter__ = MagicMock(return_value=mock_cursor)
-    mock_ctx.__exit__ = MagicMock(return_value=False)
 
-    mock_conn = MagicMock()
-    mock_conn.cursor.return_value = mock_ctx
-    return mock_conn, mock_cursor
+# ─────────────────────────────────────────────────────────────────────────────
+# Emission calculators: shared stubs
+#
+# Test classes that set FACTOR_FN get _upsert_activity / _upsert_emission
+# patched out and the named factor lookup pinned to the class's FACTOR, so
+# only the calculation math is exercised.  monkeypatch undoes it after each
+# test.  Use @with_factor(value) on a test that needs a different factor.
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _stub_calc(monkeypatch, factor_fn, factor):
+    monkeypatch.setattr(calculations, "_upsert_activity", lambda *a, **k: 1)
+    monkeypatch.setattr(calculations, "_upsert_emission", lambda *a, **k: None)
+    monkeypatch.setattr(calculations, factor_fn, lambda *a, **k: factor)
+
+
+@pytest.fixture(autouse=True)
+def _stub_emission_calc(request, monkeypatch):
+    factor_fn = getattr(request.cls, "FACTOR_FN", None)
+    if factor_fn is None:
+        return
+    _stub_calc(monkeypatch, factor_fn, getattr(request, "param", request.cls.FACTOR))
+
+
+def with_factor(value):
+    """Run the decorated test with the class's emission factor pinned to *value*."""
+    return pytest.mark.parametrize("_stub_emission_calc", [value], indirect=True)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -59,16 +118,17 @@ def make_conn(fetchall_rows=None, fetchone_row=None):
 # Formula: kWh × grid_factor
 # ─────────────────────────────────────────────────────────────────────────────
 
+_ROWS_ELEC = [(1, 1000.0, "TX", "2024-01-01", "2024-01-31")]
+
+
 class TestCalcElectricityEmissions:
+    FACTOR_FN = "get_electricity_factor"
+    FACTOR = 0.386
 
     def test_returns_list_of_emission_results(self):
-        rows = [(1, 1000.0, "TX", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_ELEC)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_electricity_factor", return_value=0.386):
-            results = calc_electricity_emissions(conn)
+        results = calc_electricity_emissions(conn)
 
         assert isinstance(results, list)
         assert len(results) == 1
@@ -76,43 +136,19 @@ class TestCalcElectricityEmissions:
 
     def test_correct_emission_math(self):
         # 1000 kWh × 0.386 = 386.0 kg CO₂e
-        rows = [(1, 1000.0, "TX", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_ELEC)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_electricity_factor", return_value=0.386):
-            results = calc_electricity_emissions(conn)
+        results = calc_electricity_emissions(conn)
 
         assert results[0].emissions_kg_co2e == pytest.approx(386.0)
         assert results[0].emissions_metric_tons == pytest.approx(0.386)
 
-    def test_scope_is_2(self):
-        rows = [(1, 500.0, "CA", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
-
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_electricity_factor", return_value=0.25):
-            results = calc_electricity_emissions(conn)
-
-        assert results[0].scope == 2
-
-    def test_empty_table_returns_empty_list(self):
-        conn, _ = make_conn(fetchall_rows=[])
-        results = calc_electricity_emissions(conn)
-        assert results == []
-
     def test_commits_after_processing(self):
-        rows = [(1, 100.0, "TX", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_ELEC)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_electricity_factor", return_value=0.386):
-            calc_electricity_emissions(conn)
+        calc_electricity_emissions(conn)
 
-        conn.commit.assert_called()
+        assert conn.commit_calls > 0
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -121,44 +157,27 @@ class TestCalcElectricityEmissions:
 # Formula: quantity × fuel_factor
 # ─────────────────────────────────────────────────────────────────────────────
 
+_ROWS_NATURAL_GAS = [(1, "natural_gas", 850.0, "therms", "2024-01-01", "2024-01-31")]
+_ROWS_HEATING_OIL = [(1, "heating_oil", 200.0, "gallons", "2024-01-01", "2024-01-31")]
+
+
 class TestCalcStationaryFuelEmissions:
+    FACTOR_FN = "get_stationary_fuel_factor"
+    FACTOR = 5.302
 
     def test_natural_gas_emission_math(self):
         # 850 therms × 5.302 = 4506.7 kg CO₂e
-        rows = [(1, "natural_gas", 850.0, "therms", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_NATURAL_GAS)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_stationary_fuel_factor", return_value=5.302):
-            results = calc_stationary_fuel_emissions(conn)
+        results = calc_stationary_fuel_emissions(conn)
 
         assert results[0].emissions_kg_co2e == pytest.approx(850 * 5.302)
 
-    def test_scope_is_1(self):
-        rows = [(1, "propane", 100.0, "gallons", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
-
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_stationary_fuel_factor", return_value=5.72):
-            results = calc_stationary_fuel_emissions(conn)
-
-        assert results[0].scope == 1
-
-    def test_empty_table_returns_empty_list(self):
-        conn, _ = make_conn(fetchall_rows=[])
-        results = calc_stationary_fuel_emissions(conn)
-        assert results == []
-
+    @with_factor(10.16)
     def test_source_table_label(self):
-        rows = [(1, "heating_oil", 200.0, "gallons", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_HEATING_OIL)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_stationary_fuel_factor", return_value=10.16):
-            results = calc_stationary_fuel_emissions(conn)
+        results = calc_stationary_fuel_emissions(conn)
 
         assert results[0].source_table == "parsed_stationary_fuel"
 
@@ -169,48 +188,31 @@ class TestCalcStationaryFuelEmissions:
 # Formula: quantity × fuel_factor
 # ─────────────────────────────────────────────────────────────────────────────
 
+_ROWS_GASOLINE = [(1, "gasoline", 100.0, "gallon", "2024-01-01", "2024-01-31")]
+_ROWS_DIESEL = [(1, "diesel", 200.0, "gallon", "2024-01-01", "2024-01-31")]
+
+
 class TestCalcVehicleFuelEmissions:
+    FACTOR_FN = "get_vehicle_fuel_factor"
+    FACTOR = 8.887
 
     def test_gasoline_emission_math(self):
         # 100 gallons × 8.887 = 888.7 kg CO₂e
-        rows = [(1, "gasoline", 100.0, "gallon", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_GASOLINE)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_vehicle_fuel_factor", return_value=8.887):
-            results = calc_vehicle_fuel_emissions(conn)
+        results = calc_vehicle_fuel_emissions(conn)
 
         assert results[0].emissions_kg_co2e == pytest.approx(888.7)
 
+    @with_factor(10.21)
     def test_diesel_emission_math(self):
         # 200 gallons × 10.21 = 2042.0 kg CO₂e
-        rows = [(1, "diesel", 200.0, "gallon", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_DIESEL)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_vehicle_fuel_factor", return_value=10.21):
-            results = calc_vehicle_fuel_emissions(conn)
+        results = calc_vehicle_fuel_emissions(conn)
 
         assert results[0].emissions_kg_co2e == pytest.approx(2042.0)
 
-    def test_scope_is_1(self):
-        rows = [(1, "gasoline", 50.0, "gallon", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
-
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_vehicle_fuel_factor", return_value=8.887):
-            results = calc_vehicle_fuel_emissions(conn)
-
-        assert results[0].scope == 1
-
-    def test_empty_table_returns_empty_list(self):
-        conn, _ = make_conn(fetchall_rows=[])
-        results = calc_vehicle_fuel_emissions(conn)
-        assert results == []
-
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 4. calc_shipping_emissions  (Scope 3)
@@ -218,61 +220,41 @@ class TestCalcVehicleFuelEmissions:
 # Formula: (weight_tons × distance_miles) × mode_factor
 # ─────────────────────────────────────────────────────────────────────────────
 
+_ROWS_TRUCK = [(1, 0.5, 300.0, "truck", "2024-01-01", "2024-01-31")]
+_ROWS_AIR = [(1, 1.0, 100.0, "air", "2024-01-01", "2024-01-31")]
+_ROWS_UNKNOWN_MODE = [(1, 1.0, 100.0, "unknown_mode", "2024-01-01", "2024-01-31")]
+
+
 class TestCalcShippingEmissions:
+    FACTOR_FN = "get_transport_factor"
+    FACTOR = 0.161
 
     def test_truck_emission_math(self):
         # 0.5 tons × 300 miles = 150 ton-miles × 0.161 = 24.15 kg CO₂e
-        rows = [(1, 0.5, 300.0, "truck", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_TRUCK)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_transport_factor", return_value=0.161):
-            results = calc_shipping_emissions(conn)
+        results = calc_shipping_emissions(conn)
 
         assert results[0].emissions_kg_co2e == pytest.approx(0.5 * 300 * 0.161)
 
+    @with_factor(2.126)
     def test_air_mode_emission_math(self):
         # 1.0 ton × 100 miles × 2.126 = 212.6 kg CO₂e
-        rows = [(1, 1.0, 100.0, "air", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_AIR)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_transport_factor", return_value=2.126):
-            results = calc_shipping_emissions(conn)
+        results = calc_shipping_emissions(conn)
 
         assert results[0].emissions_kg_co2e == pytest.approx(212.6)
 
     def test_unknown_mode_falls_back_to_default(self):
         # get_transport_factor should still return a value for unknown mode
-        rows = [(1, 1.0, 100.0, "unknown_mode", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_UNKNOWN_MODE)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_transport_factor", return_value=0.161):
-            results = calc_shipping_emissions(conn)
+        results = calc_shipping_emissions(conn)
 
         assert len(results) == 1
         assert results[0].emissions_kg_co2e > 0
 
-    def test_scope_is_3(self):
-        rows = [(1, 1.0, 100.0, "truck", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
-
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_transport_factor", return_value=0.161):
-            results = calc_shipping_emissions(conn)
-
-        assert results[0].scope == 3
-
-    def test_empty_table_returns_empty_list(self):
-        conn, _ = make_conn(fetchall_rows=[])
-        results = calc_shipping_emissions(conn)
-        assert results == []
-
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 5. calc_waste_emissions  (Scope 3)
@@ -280,59 +262,92 @@ class TestCalcShippingEmissions:
 # Formula: waste_kg × disposal_factor
 # ─────────────────────────────────────────────────────────────────────────────
 
+_ROWS_LANDFILL = [(1, 100.0, "kg", "landfill", "2024-01-01", "2024-01-31")]
+_ROWS_RECYCLE = [(2, 100.0, "kg", "recycle", "2024-01-01", "2024-01-31")]
+_ROWS_LBS = [(3, 220.0, "lbs", "landfill", "2024-01-01", "2024-01-31")]
+
+
 class TestCalcWasteEmissions:
+    FACTOR_FN = "get_waste_factor"
+    FACTOR = 1.9
 
-    def test_landfill_emission_math(self):
+    def test_landfill_emission_math(self, monkeypatch):
         # 100 kg × 1.9 = 190 kg CO₂e
-        rows = [(1, 100.0, "kg", "landfill", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_LANDFILL)
+        monkeypatch.setattr(calculations, "to_kg", lambda v, u: 100.0)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_waste_factor", return_value=1.9), \
-             patch("src.calculations.to_kg", return_value=100.0):
-            results = calc_waste_emissions(conn)
+        results = calc_waste_emissions(conn)
 
         assert results[0].emissions_kg_co2e == pytest.approx(190.0)
 
-    def test_recycle_produces_zero_emissions(self):
+    @with_factor(0.0)
+    def test_recycle_produces_zero_emissions(self, monkeypatch):
         # recycle factor = 0.0 → 0 kg CO₂e
-        rows = [(2, 100.0, "kg", "recycle", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_RECYCLE)
+        monkeypatch.setattr(calculations, "to_kg", lambda v, u: 100.0)
 
-        with patch("src.calculations._upsert_activity", return_value=2), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_waste_factor", return_value=0.0), \
-             patch("src.calculations.to_kg", return_value=100.0):
-            results = calc_waste_emissions(conn)
+        results = calc_waste_emissions(conn)
 
         assert results[0].emissions_kg_co2e == pytest.approx(0.0)
 
-    def test_lbs_are_converted_to_kg(self):
+    def test_lbs_are_converted_to_kg(self, monkeypatch):
         # to_kg must be called with the lb value
-        rows = [(3, 220.0, "lbs", "landfill", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
+        conn, _ = make_conn(fetchall_rows=_ROWS_LBS)
+        mock_to_kg = MagicMock(return_value=99.79)
+        monkeypatch.setattr(calculations, "to_kg", mock_to_kg)
 
-        with patch("src.calculations._upsert_activity", return_value=3), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_waste_factor", return_value=1.9), \
-             patch("src.calculations.to_kg", return_value=99.79) as mock_to_kg:
-            results = calc_waste_emissions(conn)
+        results = calc_waste_emissions(conn)
 
         mock_to_kg.assert_called_once_with(220.0, "lbs")
         assert results[0].emissions_kg_co2e == pytest.approx(99.79 * 1.9)
 
-    def test_scope_is_3(self):
-        rows = [(1, 50.0, "kg", "compost", "2024-01-01", "2024-01-31")]
-        conn, _ = make_conn(fetchall_rows=rows)
 
-        with patch("src.calculations._upsert_activity", return_value=1), \
-             patch("src.calculations._upsert_emission"), \
-             patch("src.calculations.get_waste_factor", return_value=0.1), \
-             patch("src.calculations.to_kg", return_value=50.0):
-            results = calc_waste_emissions(conn)
+# ─────────────────────────────────────────────────────────────────────────────
+# Behaviour shared by all five emission calculators
+# (calc_fn, factor lookup, one SELECT row, expected scope)
+# ─────────────────────────────────────────────────────────────────────────────
+
+_EMISSION_CALCS = [
+    pytest.param(
+        calc_electricity_emissions, "get_electricity_factor",
+        (1, 500.0, "CA", "2024-01-01", "2024-01-31"), 2,
+        id="electricity",
+    ),
+    pytest.param(
+        calc_stationary_fuel_emissions, "get_stationary_fuel_factor",
+        (1, "propane", 100.0, "gallons", "2024-01-01", "2024-01-31"), 1,
+        id="stationary_fuel",
+    ),
+    pytest.param(
+        calc_vehicle_fuel_emissions, "get_vehicle_fuel_factor",
+        (1, "gasoline", 50.0, "gallon", "2024-01-01", "2024-01-31"), 1,
+        id="vehicle_fuel",
+    ),
+    pytest.param(
+        calc_shipping_emissions, "get_transport_factor",
+        (1, 1.0, 100.0, "truck", "2024-01-01", "2024-01-31"), 3,
+        id="shipping",
+    ),
+    pytest.param(
+        calc_waste_emissions, "get_waste_factor",
+        (1, 50.0, "kg", "compost", "2024-01-01", "2024-01-31"), 3,
+        id="waste",
+    ),
+]
+
+
+class TestEmissionCalculators:
+
+    @pytest.mark.parametrize("calc_fn, factor_fn, row, scope", _EMISSION_CALCS)
+    def test_empty_table_returns_empty_list(self, calc_fn, factor_fn, row, scope):
+        conn, _ = make_conn(fetchall_rows=[])
+        assert calc_fn(conn) == []
 
-        assert results[0].scope == 3
+    @pytest.mark.parametrize("calc_fn, factor_fn, row, scope", _EMISSION_CALCS)
+    def test_scope(self, monkeypatch, calc_fn, factor_fn, row, scope):
+        _stub_calc(monkeypatch, factor_fn, 1.0)
+        conn, _ = make_conn(fetchall_rows=[row])
+        assert calc_fn(conn)[0].scope == scope
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -349,7 +364,7 @@ class TestCalcWaterMetrics:
         ]
         conn, _ = make_conn(fetchall_rows=rows)
 
-        with patch("src.calculations._upsert_activity"):
+        with patch.object(calculations, "_upsert_activity"):
             result = calc_water_metrics(conn)
 
         assert result["total_water_gallons"] == pytest.approx(8000.0)
@@ -360,7 +375,7 @@ class TestCalcWaterMetrics:
         rows = [(1, 1.0, "m3", "CA", "2024-01-01", "2024-01-31")]
         conn, _ = make_conn(fetchall_rows=rows)
 
-        with patch("src.calculations._upsert_activity"):
+        with patch.object(calculations, "_upsert_activity"):
             result = calc_water_metrics(conn)
 
         assert result["total_water_gallons"] == pytest.approx(264.172)
@@ -382,8 +397,7 @@ class TestCalcEnergyIntensity:
 
     def test_correct_intensity_math(self):
         # 18000 kWh ÷ 25 employees = 720.0 kWh/employee
-        conn, mock_cursor = make_conn()
-        mock_cursor.fetchone.return_value = (18000.0,)
+        conn, _ = make_conn(fetchone_row=(18000.0,))
 
         result = calc_energy_intensity(
             conn, denominator_type="employees", denominator_value=25
@@ -404,8 +418,7 @@ class TestCalcEnergyIntensity:
             calc_energy_intensity(conn, denominator_type="revenue", denominator_value=-1)
 
     def test_unit_string_contains_denominator_type(self):
-        conn, mock_cursor = make_conn()
-        mock_cursor.fetchone.return_value = (9000.0,)
+        conn, _ = make_conn(fetchone_row=(9000.0,))
 
         result = calc_energy_intensity(
             conn, denominator_type="shipments", denominator_value=100
@@ -429,7 +442,7 @@ class TestCalcWasteDiversionRate:
         ]
         conn, _ = make_conn(fetchall_rows=rows)
 
-        with patch("src.calculations.to_kg", side_effect=lambda v, u: v):
+        with patch.object(calculations, "to_kg", side_effect=lambda v, u: v):
             result = calc_waste_diversion_rate(conn)
 
         assert result["diversion_rate"] == pytest.approx(300 / 420, rel=1e-3)
@@ -439,7 +452,7 @@ class TestCalcWasteDiversionRate:
         rows = [(500.0, "kg", "recycle")]
         conn, _ = make_conn(fetchall_rows=rows)
 
-        with patch("src.calculations.to_kg", side_effect=lambda v, u: v):
+        with patch.object(calculations, "to_kg", side_effect=lambda v, u: v):
             result = calc_waste_diversion_rate(conn)
 
         assert result["diversion_rate"] == pytest.approx(1.0)
@@ -449,7 +462,7 @@ class TestCalcWasteDiversionRate:
         rows = [(500.0, "kg", "landfill")]
         conn, _ = make_conn(fetchall_rows=rows)
 
-        with patch("src.calculations.to_kg", side_effect=lambda v, u: v):
+        with patch.object(calculations, "to_kg", side_effect=lambda v, u: v):
             result = calc_waste_diversion_rate(conn)
 
         assert result["diversion_rate"] == pytest.approx(0.0)
@@ -468,7 +481,7 @@ class TestCalcWasteDiversionRate:
         ]
         conn, _ = make_conn(fetchall_rows=rows)
 
-        with patch("src.calculations.to_kg", side_effect=lambda v, u: v):
+        with patch.object(calculations, "to_kg", side_effect=lambda v, u: v):
             result = calc_waste_diversion_rate(conn)
 
         assert result["composted_kg"] == pytest.approx(200.0)
@@ -481,29 +494,28 @@ class TestCalcWasteDiversionRate:
 # Second fetchall → activity rows: (activity_type, total_kg)
 # ─────────────────────────────────────────────────────────────────────────────
 
-class TestCalcGhgSummary:
+def _make_conn_with_two_queries(scope_rows, activity_rows):
+    """cursor.fetchall() returns scope_rows on first call, activity_rows on second."""
+    cursor = _FakeCursor(None, None)
+    cursor.fetchall = iter([scope_rows, activity_rows]).__next__
+    return _FakeConn(cursor)
 
-    def _make_conn_with_two_queries(self, scope_rows, activity_rows):
-        """cursor.fetchall() returns scope_rows on first call, activity_rows on second."""
-        mock_cursor = MagicMock()
-        mock_cursor.fetchall.side_effect = [scope_rows, activity_rows]
 
-        mock_ctx = MagicMock()
-        mock_ctx.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_ctx.__exit__ = MagicMock(return_value=False)
+@pytest.fixture(scope="module")
+def two_query_conn():
+    return _make_conn_with_two_queries
 
-        mock_conn = MagicMock()
-        mock_conn.cursor.return_value = mock_ctx
-        return mock_conn
 
-    def test_scope_totals_and_grand_total(self):
+class TestCalcGhgSummary:
+
+    def test_scope_totals_and_grand_total(self, two_query_conn):
         scope_rows = [(1, 4000.0, 4.0), (2, 5000.0, 5.0), (3, 1000.0, 1.0)]
         activity_rows = [
             ("vehicle_fuel_use", 4000.0),
             ("purchased_electricity", 5000.0),
             ("waste_generation", 1000.0),
         ]
-        conn = self._make_conn_with_two_queries(scope_rows, activity_rows)
+        conn = two_query_conn(scope_rows, activity_rows)
         result = calc_ghg_summary(conn)
 
         assert result["scope1_kg_co2e"] == pytest.approx(4000.0)
@@ -512,17 +524,17 @@ class TestCalcGhgSummary:
         assert result["total_kg_co2e"] == pytest.approx(10000.0)
         assert result["total_metric_tons"] == pytest.approx(10.0)
 
-    def test_empty_db_returns_all_zeros(self):
-        conn = self._make_conn_with_two_queries([], [])
+    def test_empty_db_returns_all_zeros(self, two_query_conn):
+        conn = two_query_conn([], [])
         result = calc_ghg_summary(conn)
 
         assert result["total_kg_co2e"] == 0.0
         assert result["total_metric_tons"] == 0.0
 
-    def test_by_activity_type_dict_populated(self):
+    def test_by_activity_type_dict_populated(self, two_query_conn):
         scope_rows = [(2, 5000.0, 5.0)]
         activity_rows = [("purchased_electricity", 5000.0)]
-        conn = self._make_conn_with_two_queries(scope_rows, activity_rows)
+        conn = two_query_conn(scope_rows, activity_rows)
         result = calc_ghg_summary(conn)
 
         assert "purchased_electricity" in result["by_activity_type"]
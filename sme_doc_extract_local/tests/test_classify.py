@@ -0,0 +1,74 @@
+"""
+Unit tests for src/classify.py
+
+The classifier is pure text-in / label-out, so no mocking is needed.
+"""
+import pickle
+
+import ahocorasick
+import pytest
+
+from src import classify
+from src.classify import classify_doc, classify_doc_with_scores
+from src.constants import (
+    DOC_TYPE_DELIVERY_RECEIPT,
+    DOC_TYPE_INVOICE,
+    DOC_TYPE_UNKNOWN,
+    DOC_TYPE_UTILITY_BILL,
+)
+
+
+class TestClassifyDoc:
+
+    def test_empty_text_is_unknown(self):
+        assert classify_doc("") == DOC_TYPE_UNKNOWN
+        assert classify_doc_with_scores("   ") == (DOC_TYPE_UNKNOWN, {})
+
+    def test_no_keywords_is_unknown(self):
+        doc_type, scores = classify_doc_with_scores("lorem ipsum dolor sit amet")
+        assert doc_type == DOC_TYPE_UNKNOWN
+        assert all(v == 0 for v in scores.values())
+
+    def test_matching_is_case_insensitive(self):
+        assert classify_doc("INVOICE NUMBER 42\nBILL TO: Acme") == DOC_TYPE_INVOICE
+
+    def test_utility_bill_keywords(self):
+        text = "Account Number 123. Meter reading 4567 kWh for the billing period."
+        assert classify_doc(text) == DOC_TYPE_UTILITY_BILL
+
+    def test_repeated_keyword_counts_once(self):
+        _, scores = classify_doc_with_scores("carrier carrier carrier shipment")
+        assert scores[DOC_TYPE_DELIVERY_RECEIPT] == 2
+
+    def test_keyword_inside_longer_word_still_matches(self):
+        # Substring semantics: "usage" is found inside "usages".
+        _, scores = classify_doc_with_scores("monthly usages")
+        assert scores[DOC_TYPE_UTILITY_BILL] == 1
+
+
+class TestAutomatonCache:
+
+    @pytest.fixture(autouse=True)
+    def _fresh_automaton(self):
+        classify._get_automaton.cache_clear()
+        yield
+        classify._get_automaton.cache_clear()
+
+    def test_no_cache_written_by_default(self, monkeypatch, tmp_path):
+        monkeypatch.delenv(classify._CACHE_DIR_ENV, raising=False)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert classify_doc("INVOICE NUMBER 42\nBILL TO: Acme") == DOC_TYPE_INVOICE
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cache_written_when_enabled(self, monkeypatch, tmp_path):
+        monkeypatch.setenv(classify._CACHE_DIR_ENV, str(tmp_path))
+        classify._get_automaton()
+        assert [p.suffix for p in tmp_path.iterdir()] == [".pkl"]
+
+    def test_corrupt_cache_is_rebuilt(self, monkeypatch, tmp_path):
+        monkeypatch.setenv(classify._CACHE_DIR_ENV, str(tmp_path))
+        cache_path = tmp_path / f"classifier-{classify._keyword_table_key()}.pkl"
+        # Unpickling this raises ImportError rather than UnpicklingError.
+        cache_path.write_bytes(b"cno_such_module\nthing\n.")
+        assert classify_doc("INVOICE NUMBER 42\nBILL TO: Acme") == DOC_TYPE_INVOICE
+        assert isinstance(pickle.loads(cache_path.read_bytes()), ahocorasick.Automaton)
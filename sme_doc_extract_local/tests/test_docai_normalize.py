@@ -0,0 +1,61 @@
+"""
+Unit tests for src/docai_normalize.py
+
+Documents are built directly from the Document AI proto types, so no
+network access or mocking is needed.
+"""
+from google.cloud import documentai
+
+from src.docai_normalize import build_enriched_text, normalize, normalize_and_enrich
+
+
+def _anchor(text, fragment):
+    start = text.index(fragment)
+    return documentai.Document.TextAnchor(
+        text_segments=[{"start_index": start, "end_index": start + len(fragment)}]
+    )
+
+
+def _cell(text, fragment):
+    return {"layout": {"text_anchor": _anchor(text, fragment)}}
+
+
+def make_document(with_table=True):
+    text = "INVOICE 42\nItem Qty\nWidget 3\n"
+    tables = []
+    if with_table:
+        tables.append(
+            {
+                "header_rows": [{"cells": [_cell(text, "Item"), _cell(text, "Qty")]}],
+                "body_rows": [{"cells": [_cell(text, "Widget"), _cell(text, "3")]}],
+            }
+        )
+    return documentai.Document(text=text, pages=[{"tables": tables}, {}])
+
+
+class TestNormalizeAndEnrich:
+
+    def test_matches_normalize_then_build_enriched_text(self):
+        doc = make_document()
+        norm = normalize(doc)
+        bundle = normalize_and_enrich(doc)
+        assert bundle.full_text == norm.full_text
+        assert bundle.enriched_text == build_enriched_text(norm)
+        assert bundle.page_count == norm.page_count == 2
+        assert bundle.table_count == 1
+
+    def test_table_rows_are_tab_separated(self):
+        bundle = normalize_and_enrich(make_document())
+        assert "[TABLES]" in bundle.enriched_text
+        assert "Item\tQty\nWidget\t3" in bundle.enriched_text
+
+    def test_no_tables_gives_stripped_text(self):
+        bundle = normalize_and_enrich(make_document(with_table=False))
+        assert bundle.enriched_text == "INVOICE 42\nItem Qty\nWidget 3"
+        assert bundle.table_count == 0
+
+    def test_empty_document(self):
+        bundle = normalize_and_enrich(documentai.Document())
+        assert bundle.full_text == ""
+        assert bundle.enriched_text == ""
+        assert bundle.page_count == 0
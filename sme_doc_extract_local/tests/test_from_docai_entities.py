@@ -0,0 +1,103 @@
+"""
+Unit tests for src/extractors/from_docai_entities.py
+
+Documents are built directly from the Document AI proto types.
+"""
+from google.cloud import documentai
+
+from src.constants import DOC_TYPE_INVOICE
+from src.extractors.from_docai_entities import (
+    extract_invoice_from_entities,
+    mean_entity_confidence,
+)
+from src.main import _confident_entity_extraction
+
+
+def make_document(entities):
+    return documentai.Document(text="", entities=entities)
+
+
+class TestMeanEntityConfidence:
+
+    def test_no_entities(self):
+        assert mean_entity_confidence(make_document([])) is None
+
+    def test_mean_of_top_level_entities(self):
+        doc = make_document([
+            {"type_": "supplier_name", "confidence": 0.8},
+            {"type_": "total_amount", "confidence": 1.0},
+        ])
+        assert abs(mean_entity_confidence(doc) - 0.9) < 1e-6
+
+
+class TestExtractInvoiceFromEntities:
+
+    def test_maps_fields_and_prefers_normalized_value(self):
+        doc = make_document([
+            {"type_": "supplier_name", "mention_text": " ACME Corp "},
+            {"type_": "receipt_date", "mention_text": "Jan 2, 2024",
+             "normalized_value": {"text": "2024-01-02"}},
+            {"type_": "total_amount", "mention_text": "$110.00"},
+            {"type_": "total_amount", "mention_text": "999"},
+        ])
+        result = extract_invoice_from_entities(doc)
+        assert result["vendor_name"] == "ACME Corp"
+        assert result["invoice_date"] == "2024-01-02"
+        assert result["total"] == "$110.00"  # first entity wins
+        assert result["tax"] is None
+        assert result["line_items"] == []
+
+    def test_line_item_properties(self):
+        doc = make_document([
+            {"type_": "invoice_id", "mention_text": "INV-7"},
+            {"type_": "total_amount", "mention_text": "10"},
+            {"type_": "line_item", "mention_text": "Bolts 2 x 5", "properties": [
+                {"type_": "line_item/quantity", "mention_text": "2"},
+                {"type_": "line_item/unit_price", "mention_text": "5"},
+            ]},
+        ])
+        (item,) = extract_invoice_from_entities(doc)["line_items"]
+        assert item == {
+            "description": "Bolts 2 x 5",
+            "quantity": "2",
+            "unit_price": "5",
+            "total_price": None,
+        }
+
+    def test_no_mappable_entities_returns_none(self):
+        doc = make_document([{"type_": "purchase_order", "mention_text": "PO-1"}])
+        assert extract_invoice_from_entities(doc) is None
+
+    def test_missing_total_or_identity_returns_none(self):
+        no_total = make_document([{"type_": "supplier_name", "mention_text": "ACME"}])
+        no_identity = make_document([
+            {"type_": "total_amount", "mention_text": "10"},
+            {"type_": "invoice_date", "mention_text": "2024-01-02"},
+        ])
+        assert extract_invoice_from_entities(no_total) is None
+        assert extract_invoice_from_entities(no_identity) is None
+
+
+class TestConfidentEntityExtraction:
+
+    def test_complete_confident_entities_skip_gemini(self):
+        doc = make_document([
+            {"type_": "supplier_name", "mention_text": "ACME", "confidence": 0.99},
+            {"type_": "total_amount", "mention_text": "10", "confidence": 0.98},
+        ])
+        result = _confident_entity_extraction(doc, DOC_TYPE_INVOICE, verbose=False)
+        assert result["vendor_name"] == "ACME"
+
+    def test_sparse_confident_entities_fall_back_to_gemini(self):
+        doc = make_document([
+            {"type_": "invoice_date", "mention_text": "2024-01-02", "confidence": 0.99},
+            {"type_": "currency", "mention_text": "USD", "confidence": 0.99},
+        ])
+        assert _confident_entity_extraction(doc, DOC_TYPE_INVOICE, verbose=False) is None
+
+    def test_low_confidence_falls_back_to_gemini(self):
+        doc = make_document([
+            {"type_": "supplier_name", "mention_text": "ACME", "confidence": 0.5},
+            {"type_": "total_amount", "mention_text": "10", "confidence": 0.5},
+        ])
+        assert _confident_entity_extraction(doc, DOC_TYPE_INVOICE, verbose=False) is None
@@ -0,0 +1,69 @@
+"""
+Unit tests for src/io_utils.py
+
+Uses pytest's tmp_path fixture for all file system access.
+"""
+import json
+
+from src.constants import PDF_MIME_TYPE
+from src.io_utils import (
+    build_meta,
+    check_file_content,
+    copy_artifacts,
+    write_all_artifacts,
+)
+
+
+class TestCheckFileContent:
+
+    def test_empty_file_is_rejected(self):
+        assert check_file_content(b"", PDF_MIME_TYPE) == "File is empty."
+
+    def test_pdf_header_may_follow_leading_junk(self):
+        assert check_file_content(b"\r\n%PDF-1.7\n", PDF_MIME_TYPE) is None
+
+    def test_html_saved_as_pdf_is_rejected(self):
+        assert check_file_content(b"<html>", PDF_MIME_TYPE) is not None
+
+    def test_image_with_other_image_signature_is_accepted(self):
+        # A WebP saved with a .jpg extension.
+        assert check_file_content(b"RIFF\x00\x00\x00\x00WEBPVP8X", "image/jpeg") is None
+
+
+class TestCopyArtifacts:
+
+    def test_copies_and_rewrites_source_file(self, tmp_path):
+        outdir = tmp_path / "out"
+        meta = build_meta(
+            source_file="/in/a.pdf",
+            status="success",
+            processor_name="p",
+            gemini_model="g",
+            page_count=1,
+            elapsed_seconds=0.5,
+            doc_type="invoice",
+        )
+        write_all_artifacts(
+            pdf_path=tmp_path / "a.pdf",
+            outdir=outdir,
+            raw_text="hello",
+            extraction_payload={"source_file": "/in/a.pdf", "extraction": {"total": 1.0}},
+            warnings=[],
+            meta=meta,
+        )
+
+        dest = copy_artifacts(
+            src_pdf_path=tmp_path / "a.pdf",
+            pdf_path=tmp_path / "b.pdf",
+            outdir=outdir,
+            source_file="/in/b.pdf",
+        )
+
+        assert dest == outdir / "b"
+        assert (dest / "raw_text.txt").read_text(encoding="utf-8") == "hello"
+        extraction = json.loads((dest / "extraction.json").read_text(encoding="utf-8"))
+        assert extraction == {"source_file": "/in/b.pdf", "extraction": {"total": 1.0}}
+        assert json.loads((dest / "meta.json").read_text(encoding="utf-8"))["source_file"] == "/in/b.pdf"
+        # The original output is untouched.
+        original = json.loads((outdir / "a" / "extraction.json").read_text(encoding="utf-8"))
+        assert original["source_file"] == "/in/a.pdf"
@@ -0,0 +1,68 @@
+"""
+Unit tests for process_batch in src/main.py
+
+The Document AI stage is replaced with a stub that returns a finished
+summary, so no network client or credentials are needed.
+"""
+import pytest
+
+from src import main
+
+# Non-empty so process_batch does not build the map from a real config.
+_PROCESSORS = {"invoice": "projects/p/locations/us/processors/invoice"}
+
+
+@pytest.fixture
+def docai_calls(monkeypatch):
+    """Stub _run_docai_stage; return the list of (file name, bytes) it was given."""
+    calls = []
+
+    def _fake_stage(pdf_path, *, outdir, pdf_bytes=None, **_kwargs):
+        calls.append((pdf_path.name, pdf_bytes))
+        return {"status": "success", "file": pdf_path.name, "output_dir": str(outdir)}
+
+    monkeypatch.setattr(main, "_run_docai_stage", _fake_stage)
+    return calls
+
+
+def _write_files(tmp_path, contents):
+    paths = []
+    for name, content in contents:
+        path = tmp_path / name
+        path.write_bytes(content)
+        paths.append(path)
+    return paths
+
+
+class TestProcessBatchDuplicates:
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_identical_files_processed_once(self, tmp_path, docai_calls, concurrency):
+        files = _write_files(
+            tmp_path, [("a.pdf", b"%PDF-x"), ("b.pdf", b"%PDF-x"), ("c.pdf", b"%PDF-y")]
+        )
+        results = main.process_batch(
+            files,
+            outdir=tmp_path / "out",
+            config=None,
+            docai_client=None,
+            processor_by_type=_PROCESSORS,
+            concurrency=concurrency,
+        )
+        assert sorted(name for name, _ in docai_calls) in (["a.pdf", "c.pdf"], ["b.pdf", "c.pdf"])
+        assert [r["file"] for r in results] == ["a.pdf", "b.pdf", "c.pdf"]
+        assert all(r["status"] == "success" for r in results)
+
+    def test_stage_reuses_bytes_already_read(self, tmp_path, docai_calls):
+        files = _write_files(tmp_path, [("a.pdf", b"%PDF-x")])
+        main.process_batch(
+            files, outdir=tmp_path / "out", config=None, docai_client=None, processor_by_type=_PROCESSORS
+        )
+        assert docai_calls == [("a.pdf", b"%PDF-x")]
+
+    def test_unreadable_files_are_not_duplicates(self, tmp_path, docai_calls):
+        missing = [tmp_path / "gone1.pdf", tmp_path / "gone2.pdf"]
+        main.process_batch(
+            missing, outdir=tmp_path / "out", config=None, docai_client=None, processor_by_type=_PROCESSORS
+        )
+        assert docai_calls == [("gone1.pdf", None), ("gone2.pdf", None)]
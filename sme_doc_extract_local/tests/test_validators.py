@@ -0,0 +1,95 @@
+"""
+Unit tests for src/validators.py
+
+Validators are pure dict-in / dict-out functions, so no mocking is needed.
+"""
+from datetime import date
+
+from src.validators import _parse_iso_cached, _to_float, _to_iso_date, validate, validate_many
+
+
+class TestToFloat:
+
+    def test_strips_currency_symbols_commas_and_spaces(self):
+        assert _to_float("$1,234.50") == 1234.5
+        assert _to_float(" € 12 ") == 12.0
+
+    def test_numbers_pass_through(self):
+        assert _to_float(3) == 3.0
+
+    def test_plain_numeric_strings(self):
+        assert _to_float("1234.50") == 1234.5
+        assert _to_float(" -7 ") == -7.0
+
+    def test_unparseable_is_none(self):
+        assert _to_float("n/a") is None
+        assert _to_float(None) is None
+        assert _to_float([1]) is None
+
+
+class TestToIsoDate:
+
+    def test_iso_string_unchanged(self):
+        assert _to_iso_date("2024-03-05") == "2024-03-05"
+
+    def test_us_format_is_month_first(self):
+        assert _to_iso_date("03/05/2024") == "2024-03-05"
+
+    def test_common_layouts(self):
+        for text in ("2024-03-05T10:30:00Z", "3/5/2024", "05-Mar-2024", "2024/03/05", "March 5, 2024"):
+            assert _to_iso_date(text) == "2024-03-05", text
+
+    def test_date_object(self):
+        assert _to_iso_date(date(2024, 3, 5)) == "2024-03-05"
+
+    def test_blank_and_garbage_are_none(self):
+        assert _to_iso_date("  ") is None
+        assert _to_iso_date("not a date") is None
+
+    def test_repeated_strings_are_parsed_once(self):
+        _parse_iso_cached.cache_clear()
+        for _ in range(3):
+            assert _to_iso_date(" Jan 5, 2024 ") == "2024-01-05"
+        info = _parse_iso_cached.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+
+class TestValidate:
+
+    def test_invoice_total_mismatch_warns(self):
+        d, warnings, conf = validate(
+            "invoice", {"subtotal": "100", "tax": "10", "total": "200"}
+        )
+        assert d["total"] == 200.0
+        assert any("Total mismatch" in w for w in warnings)
+        assert conf["total"] < conf["subtotal"]
+
+    def test_logistics_mode_outside_allowed_set_is_nulled(self):
+        d, warnings, _ = validate("logistics", {"mode": "Teleport"})
+        assert d["mode"] is None
+        assert warnings
+
+    def test_unknown_doc_type_returns_raw(self):
+        raw = {"x": 1}
+        assert validate("unknown", raw) == (raw, ["No validator for doc_type='unknown'"], {})
+
+    def test_copies_raw_unless_in_place(self):
+        raw = {"total": "10"}
+        d, _, _ = validate("invoice", raw)
+        assert d is not raw and raw["total"] == "10"
+
+        d, _, _ = validate("invoice", raw, in_place=True)
+        assert d is raw and raw["total"] == 10.0
+
+
+class TestValidateMany:
+
+    def test_matches_validate_per_document(self):
+        docs = [{"mode": "AIR", "distance_km": "12"}, {"mode": "Teleport"}]
+        assert validate_many("logistics", docs) == [validate("logistics", d) for d in docs]
+
+    def test_unknown_doc_type_returns_each_raw(self):
+        docs = [{"x": 1}, {"y": 2}]
+        results = validate_many("unknown", docs)
+        assert [d for d, _, _ in results] == docs
+        assert all(w == ["No validator for doc_type='unknown'"] for _, w, _ in results)
@@ -0,0 +1,86 @@
+"""
+Unit tests for the CSV aggregation in src/vehicleDataIngest.py
+
+_parse_and_merge only reads a file, so each test writes a small CSV to
+tmp_path; nothing touches the database.
+"""
+import pytest
+
+from src.vehicleDataIngest import _parse_and_merge
+
+_HEADER = "period_start,period_end,fuel_type,unit,fuel_consumed\n"
+
+
+def _write_csv(tmp_path, *rows):
+    path = tmp_path / "vehicleData.csv"
+    path.write_text(_HEADER + "".join(r + "\n" for r in rows), encoding="utf-8")
+    return path
+
+
+class TestParseAndMerge:
+
+    def test_sums_rows_sharing_a_key(self, tmp_path):
+        path = _write_csv(
+            tmp_path,
+            "2024-01-01,2024-01-31,Diesel,liters,10.5",
+            "2024-01-01,2024-01-31,diesel,litre,4.5",
+        )
+        assert _parse_and_merge(path) == [
+            ("diesel", 15.0, "liter", "2024-01-01", "2024-01-31"),
+        ]
+
+    def test_rows_sorted_by_period_then_fuel_and_unit(self, tmp_path):
+        path = _write_csv(
+            tmp_path,
+            "2024-02-01,2024-02-29,Gasoline,gallons,1",
+            "2024-01-01,2024-01-31,Gasoline,gallons,2",
+            "2024-01-01,2024-01-31,Diesel,gallons,3",
+            "2024-01-01,2024-01-15,Gasoline,gallons,4",
+        )
+        assert [(r[3], r[4], r[0]) for r in _parse_and_merge(path)] == [
+            ("2024-01-01", "2024-01-15", "gasoline"),
+            ("2024-01-01", "2024-01-31", "diesel"),
+            ("2024-01-01", "2024-01-31", "gasoline"),
+            ("2024-02-01", "2024-02-29", "gasoline"),
+        ]
+
+    def test_unrecognised_or_bad_rows_are_skipped(self, tmp_path):
+        path = _write_csv(
+            tmp_path,
+            "2024-01-01,2024-01-31,Kerosene,liters,1",
+            "2024-01-01,2024-01-31,Diesel,barrels,1",
+            "2024-01-01,2024-01-31,Diesel,liters,n/a",
+            "2024-01-01,2024-01-31,Diesel,liters,2",
+        )
+        assert _parse_and_merge(path) == [
+            ("diesel", 2.0, "liter", "2024-01-01", "2024-01-31"),
+        ]
+
+    def test_rows_with_blank_period_are_skipped(self, tmp_path):
+        path = _write_csv(
+            tmp_path,
+            ",2024-01-31,Diesel,liters,1",
+            "2024-01-01, ,Diesel,liters,1",
+            "2024-01-01,2024-01-31,Diesel,liters,2",
+        )
+        assert _parse_and_merge(path) == [
+            ("diesel", 2.0, "liter", "2024-01-01", "2024-01-31"),
+        ]
+
+    def test_columns_found_by_header_name(self, tmp_path):
+        path = tmp_path / "vehicleData.csv"
+        path.write_text(
+            "vehicle,fuel_consumed,unit,fuel_type,period_end,period_start\n"
+            "van-1,7,gallons,Gasoline,2024-01-31,2024-01-01\n"
+            "\n",
+            encoding="utf-8",
+        )
+        assert _parse_and_merge(path) == [
+            ("gasoline", 7.0, "gallon", "2024-01-01", "2024-01-31"),
+        ]
+
+    def test_missing_column_raises(self, tmp_path):
+        path = tmp_path / "vehicleData.csv"
+        path.write_text("period_start,period_end,fuel_type,unit\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="fuel_consumed"):
+            _parse_and_merge(path)